@@ -0,0 +1,254 @@
+import argparse
+import importlib
+import json
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+PROYECTOS = {
+    'vuelos': RAIZ / 'PROYECTOFINAL',
+    'compresion': RAIZ / 'ETAPAS' / 'Etapa 9',
+    'coautores': RAIZ / 'ETAPAS' / 'Etapa 10',
+    'recomendador': RAIZ / 'PARCIALES' / 'Parcial3',
+}
+
+# Tamaños de los datos sintéticos de cada proyecto en cada escala
+ESCALAS = {
+    'pequena': {'aeropuertos': [200, 1000], 'megabytes': [1], 'autores': [2000], 'municipios': [1000, 10000]},
+    'mediana': {'aeropuertos': [1000, 5000], 'megabytes': [1, 4], 'autores': [2000, 10000],
+                'municipios': [10000, 100000]},
+    'grande': {'aeropuertos': [5000, 20000], 'megabytes': [4, 16], 'autores': [10000, 50000],
+               'municipios': [100000, 500000]},
+}
+REPETICIONES = 3
+CONSULTAS = 20
+MAX_ESCALAS = 3
+TOLERANCIA = 0.10
+RUTA_RESULTADOS = RAIZ / 'BENCHMARKS' / 'resultados.json'
+
+
+def cargar_modulos(directorio, *nombres):
+    # Los proyectos se importan entre sí por nombre (todos tienen un main.py y
+    # varios un benchmark.py), así que cada proyecto se importa con su carpeta
+    # al frente de sys.path y sin los módulos de otro proyecto en sys.modules.
+    # Los módulos retornados siguen funcionando después de restaurar ambos.
+    carpetas = {str(carpeta) for carpeta in PROYECTOS.values()}
+    anteriores = {nombre: modulo for nombre, modulo in sys.modules.items()
+                  if str(Path(getattr(modulo, '__file__', None) or '/').parent) in carpetas}
+    for nombre in anteriores:
+        del sys.modules[nombre]
+    sys.path.insert(0, str(directorio))
+    try:
+        return [importlib.import_module(nombre) for nombre in nombres]
+    finally:
+        sys.path.remove(str(directorio))
+        for nombre, modulo in list(sys.modules.items()):
+            if str(Path(getattr(modulo, '__file__', None) or '/').parent) == str(directorio):
+                del sys.modules[nombre]
+        sys.modules.update(anteriores)
+
+
+def medir(proyecto, operacion, parametros, funcion, preparar=None, repeticiones=REPETICIONES):
+    # Tiempo mínimo y promedio de varias repeticiones y, en una corrida
+    # aparte, el pico de memoria con tracemalloc (que hace más lento el
+    # código medido). preparar se llama antes de cada corrida, fuera del
+    # tiempo medido, y su resultado se pasa a funcion.
+    preparar = preparar or (lambda: None)
+    tiempos = []
+    for _ in range(repeticiones):
+        argumento = preparar()
+        inicio = time.perf_counter()
+        funcion(argumento)
+        tiempos.append(time.perf_counter() - inicio)
+    argumento = preparar()
+    tracemalloc.start()
+    funcion(argumento)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    resultado = {
+        'proyecto': proyecto,
+        'operacion': operacion,
+        'parametros': parametros,
+        'repeticiones': repeticiones,
+        'segundos_min': min(tiempos),
+        'segundos_promedio': sum(tiempos) / len(tiempos),
+        'memoria_pico_mb': pico / 2**20,
+    }
+    print(f"{proyecto:>13} {operacion:>31} {json.dumps(parametros, ensure_ascii=False):<58} "
+          f"{resultado['segundos_min']:>10.4f} {resultado['memoria_pico_mb']:>10.2f}")
+    return resultado
+
+
+def casos_vuelos(escala, directorio):
+    benchmark, main = cargar_modulos(PROYECTOS['vuelos'], 'benchmark', 'main')
+    for n in escala['aeropuertos']:
+        ciudades, filas = benchmark.generar_red(n)
+        archivo_rutas = directorio / f"red_{n}.csv"
+        benchmark.escribir_csv(filas, archivo_rutas)
+        buscador = main.BuscadorRutas(archivo_rutas, archivo_historial=None)
+        aleatorio = random.Random(n)
+        consultas = [tuple(aleatorio.sample(ciudades, 2)) for _ in range(CONSULTAS)]
+        parametros = {'aeropuertos': n, 'tramos': len(filas), 'consultas': len(consultas),
+                      'max_escalas': MAX_ESCALAS}
+        yield medir('vuelos', 'encontrar_todas_las_rutas', parametros, lambda _: [
+            buscador.encontrar_todas_las_rutas(origen, destino, max_escalas=MAX_ESCALAS)
+            for origen, destino in consultas])
+
+
+def casos_compresion(escala, directorio):
+    benchmark, main = cargar_modulos(PROYECTOS['compresion'], 'benchmark', 'main')
+    for megabytes in escala['megabytes']:
+        texto = benchmark.generar_corpus(megabytes * 2**20)
+        parametros = {'megabytes': megabytes}
+        yield medir('compresion', 'comprimir_texto', parametros,
+                    lambda diccionario: main.comprimir_texto(texto, diccionario), main.Diccionario)
+
+        diccionario = main.Diccionario()
+        comprimido = main.comprimir_texto(texto, diccionario)
+        yield medir('compresion', 'descomprimir_texto', parametros,
+                    lambda _: main.descomprimir_texto(comprimido, diccionario))
+
+
+def casos_coautores(escala, directorio):
+    benchmark, main = cargar_modulos(PROYECTOS['coautores'], 'benchmark', 'main')
+    for n in escala['autores']:
+        _, papers = benchmark.generate_papers(n, 2 * n)
+        grafo = main.AutorGraph()
+        for paper in papers:
+            grafo.add_paper(paper)
+
+        def sin_cache():
+            # Sin los diámetros guardados cada corrida recalcula todo
+            grafo.component_cache.clear()
+
+        parametros = {'autores': n, 'papers': len(papers)}
+        yield medir('coautores', 'find_max_connection_level', parametros,
+                    lambda _: grafo.find_max_connection_level(processes=1), sin_cache)
+
+
+def generar_municipios(n_municipios, semilla=42):
+    # Municipios sintéticos con la estructura de datos de Parcial3: nombre,
+    # temperatura, altura, actividades y las cinco distancias en km
+    aleatorio = random.Random(semilla)
+    municipios = []
+    for i in range(n_municipios):
+        nombre = f"{aleatorio.choice(string.ascii_uppercase)}unicipio{i:07d}"
+        municipios.append([nombre, aleatorio.randint(5, 32), aleatorio.randint(0, 3500),
+                           'Turismo de naturaleza, entre otros.',
+                           *[aleatorio.randint(0, 400) for _ in range(5)]])
+    return municipios
+
+
+def casos_recomendador(escala, directorio):
+    main, = cargar_modulos(PROYECTOS['recomendador'], 'main')
+    for n in escala['municipios']:
+        municipios = generar_municipios(n)
+        aleatorio = random.Random(n)
+        consultas = aleatorio.sample(range(n), min(n, CONSULTAS))
+        parametros = {'municipios': n, 'consultas': len(consultas)}
+        # El ciclo original: la similitud contra todos los demás municipios
+        yield medir('recomendador', 'calcular_similitud', parametros, lambda _: [
+            min((main.calcular_similitud(municipios[i], municipio), j)
+                for j, municipio in enumerate(municipios) if j != i)
+            for i in consultas], repeticiones=1)
+
+        motor = main.MotorRecomendaciones(municipios)
+        yield medir('recomendador', 'MotorRecomendaciones.recomendar', parametros, lambda _: [
+            motor.recomendar(municipios[i][0]) for i in consultas])
+
+
+CASOS = {'vuelos': casos_vuelos, 'compresion': casos_compresion, 'coautores': casos_coautores,
+         'recomendador': casos_recomendador}
+
+
+def version_codigo():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(proyectos, escala):
+    print(f"{'Proyecto':>13} {'Operación':>31} {'Parámetros':<58} {'Mínimo (s)':>10} {'Pico (MB)':>10}")
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for proyecto in proyectos:
+            resultados.extend(CASOS[proyecto](ESCALAS[escala], Path(directorio)))
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'version': version_codigo(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'escala': escala,
+        'resultados': resultados,
+    }
+
+
+def clave(resultado):
+    return (resultado['proyecto'], resultado['operacion'],
+            json.dumps(resultado['parametros'], sort_keys=True))
+
+
+def comparar(anterior, actual, tolerancia=TOLERANCIA):
+    # Compara los tiempos mínimos de los casos presentes en las dos corridas;
+    # retorna los casos que se hicieron más lentos que la tolerancia
+    previos = {clave(resultado): resultado for resultado in anterior['resultados']}
+    regresiones = []
+    print(f"\nComparación con {anterior.get('version') or anterior['fecha']}:")
+    print(f"{'Proyecto':>13} {'Operación':>31} {'Parámetros':<58} {'Antes (s)':>10} {'Ahora (s)':>10} {'Cambio':>8}")
+    for resultado in actual['resultados']:
+        previo = previos.get(clave(resultado))
+        if previo is None:
+            continue
+        razon = resultado['segundos_min'] / previo['segundos_min']
+        marca = ""
+        if razon > 1 + tolerancia:
+            marca = "  regresión"
+            regresiones.append(resultado)
+        print(f"{resultado['proyecto']:>13} {resultado['operacion']:>31} {clave(resultado)[2]:<58} "
+              f"{previo['segundos_min']:>10.4f} {resultado['segundos_min']:>10.4f} {razon:>7.2f}x{marca}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de los proyectos con salida en JSON.")
+    parser.add_argument('proyectos', nargs='*',
+                        help=f"proyectos a medir entre {', '.join(CASOS)} (por defecto, todos)")
+    parser.add_argument('-e', '--escala', choices=ESCALAS, default='pequena')
+    parser.add_argument('-o', '--salida', default=RUTA_RESULTADOS)
+    parser.add_argument('-c', '--comparar', help="JSON de una corrida anterior")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA)
+    argumentos = parser.parse_args()
+    desconocidos = set(argumentos.proyectos) - set(CASOS)
+    if desconocidos:
+        parser.error(f"proyectos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    # La corrida anterior se lee antes de escribir la nueva: así -c puede ser
+    # el mismo archivo que -o
+    anterior = None
+    if argumentos.comparar:
+        with open(argumentos.comparar, 'r', encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+
+    actual = ejecutar(argumentos.proyectos or list(CASOS), argumentos.escala)
+    with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(actual, archivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados guardados en {argumentos.salida}")
+
+    if anterior is not None:
+        if comparar(anterior, actual, argumentos.tolerancia):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
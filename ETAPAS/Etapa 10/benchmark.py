@@ -0,0 +1,97 @@
+import random
+import sys
+import time
+
+from main import AutorGraph
+
+# Cada cuántos papers insertados se hace una ronda de consultas, y cada
+# cuántas rondas se pide además el nivel máximo de conexión
+QUERY_EVERY = 50
+DIAMETER_EVERY = 2
+QUERIES_PER_ROUND = 20
+
+
+def generate_papers(n_authors, n_papers, group_size=20, cross_probability=0.002, seed=42):
+    # Papers sintéticos: los autores colaboran casi siempre dentro de su grupo
+    # y de vez en cuando con otro grupo, así la red tiene muchas componentes
+    # que se van uniendo a medida que llegan papers
+    rng = random.Random(seed)
+    authors = [f"Autor{i:07d}" for i in range(n_authors)]
+    papers = []
+    for _ in range(n_papers):
+        first = rng.randrange(n_authors)
+        group = first - first % group_size
+        paper = [authors[first]]
+        for _ in range(rng.randint(1, 3)):
+            if rng.random() < cross_probability:
+                paper.append(authors[rng.randrange(n_authors)])
+            else:
+                paper.append(authors[min(n_authors - 1, group + rng.randrange(group_size))])
+        papers.append(paper)
+    return authors, papers
+
+
+def run_stream(papers, authors, incremental, seed=0):
+    # Inserta los papers uno por uno intercalando consultas. Sin el modo
+    # incremental cada respuesta se calcula desde cero: BFS para la conexión
+    # y diámetros recalculados para el nivel máximo.
+    rng = random.Random(seed)
+    graph = AutorGraph()
+    times = {'insert': 0.0, 'reach': 0.0, 'level': 0.0, 'diameter': 0.0}
+    answers = []
+    for count, paper in enumerate(papers, 1):
+        start = time.perf_counter()
+        graph.add_paper(paper)
+        times['insert'] += time.perf_counter() - start
+        if count % QUERY_EVERY:
+            continue
+
+        pairs = [(rng.choice(authors), rng.choice(authors)) for _ in range(QUERIES_PER_ROUND)]
+        start = time.perf_counter()
+        if incremental:
+            answers.extend(graph.are_connected(a, b) for a, b in pairs)
+        else:
+            answers.extend(graph._bidirectional_search(a, b) is not None for a, b in pairs)
+        times['reach'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        if incremental:
+            answers.extend(graph.find_connection_level(a, b) for a, b in pairs)
+        else:
+            for a, b in pairs:
+                path = graph._bidirectional_search(a, b)
+                answers.append(-1 if path is None else len(path) - 1)
+        times['level'] += time.perf_counter() - start
+
+        if count // QUERY_EVERY % DIAMETER_EVERY == 0:
+            start = time.perf_counter()
+            if not incremental:
+                graph.component_cache.clear()
+            answers.append(graph.find_max_connection_level(processes=1)[0])
+            times['diameter'] += time.perf_counter() - start
+    return times, answers
+
+
+def benchmark_stream(sizes):
+    sizes = sizes or [2000, 20000]
+    print(f"{'Autores':>9} {'Papers':>8} {'Modo':>12} {'Inserción (s)':>14} "
+          f"{'¿Conectados? (s)':>17} {'Nivel (s)':>10} {'Nivel máx. (s)':>15}")
+    for n in sizes:
+        authors, papers = generate_papers(n, 2 * n)
+        results = []
+        for incremental in (False, True):
+            times, answers = run_stream(papers, authors, incremental)
+            results.append(answers)
+            mode = "incremental" if incremental else "desde cero"
+            print(f"{n:>9} {len(papers):>8} {mode:>12} {times['insert']:>14.3f} "
+                  f"{times['reach']:>17.3f} {times['level']:>10.3f} {times['diameter']:>15.3f}")
+        if results[0] != results[1]:
+            raise AssertionError(f"Respuestas distintas con {n} autores")
+
+
+def main():
+    benchmark_stream([int(n) for n in sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,696 @@
+import multiprocessing
+import os
+import re
+import numpy as np
 import pandas as pd
-from collections import defaultdict, deque
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Tamaño mínimo de una capa de la BFS para repartir sus excentricidades entre
+# varios procesos
+PARALLEL_MIN_FRINGE = 64
+
+# Columnas de autores del archivo de referencias ('Autor 1', 'Autor 2', ...)
+AUTHOR_COLUMN = re.compile(r'Autor\s*(\d+)')
+
+# Versión del formato de la caché binaria del grafo (<archivo>.npz)
+GRAPH_CACHE_VERSION = 1
+
+# Grafo compartido con los procesos de trabajo (con fork se hereda sin copiarlo)
+_shared_graph = None
+
+def _init_worker(graph):
+    global _shared_graph
+    _shared_graph = graph
+
+def _eccentricity(source):
+    return _shared_graph.eccentricity(source)
 
 class AutorGraph:
     def __init__(self):
         self.graph = defaultdict(set)
         self.all_authors = set()
+        # Distancias desde los autores de referencia (ver build_landmarks)
+        self.landmarks = []
+        # Union-find de componentes conexas: representante y tamaño
+        self.parent = {}
+        self.size = {}
+        # Resultados por componente (diámetro y excentricidades), por representante
+        self.component_cache = {}
         
     def add_paper(self, authors):
-        for i in range(len(authors)):
-            for j in range(len(authors)):
-                if i != j and authors[i] and authors[j]:
-                    self.graph[authors[i]].add(authors[j])
-                    self.all_authors.add(authors[i])
-                    self.all_authors.add(authors[j])
-                    
-    def find_connection_level(self, author1, author2):
-        if author1 not in self.graph or author2 not in self.graph:
-            return -1
-        
-        if author1 == author2:
-            return 0
+        # Cada autor del paper queda conectado con los demás autores del paper.
+        # Solo las aristas nuevas invalidan resultados: una arista entre dos
+        # componentes las une y una arista interna puede acortar distancias.
+        authors = [author for author in authors if author]
+        changed = False
+        for author in authors:
+            coauthors = self.graph[author] if author in self.graph else None
+            for coauthor in authors:
+                if coauthor == author or (coauthors is not None and coauthor in coauthors):
+                    continue
+                if coauthors is None:
+                    coauthors = self.graph[author]
+                    self.all_authors.add(author)
+                    self.parent[author] = author
+                    self.size[author] = 1
+                coauthors.add(coauthor)
+                if coauthor in self.parent:
+                    self._union(author, coauthor)
+                changed = True
+        if changed:
+            # Las distancias guardadas dejan de ser válidas con nuevas aristas
+            self.landmarks = []
 
-        visited = set()
-        queue = deque([(author1, 0)])
-        visited.add(author1)
-        
-        while queue:
-            current_author, level = queue.popleft()
+    def _find(self, author):
+        parent = self.parent
+        while parent[author] != author:
+            parent[author] = parent[parent[author]]
+            author = parent[author]
+        return author
 
-            for coauthor in self.graph[current_author]:
-                if coauthor == author2:
-                    return level + 1
-                    
-                if coauthor not in visited:
-                    visited.add(coauthor)
-                    queue.append((coauthor, level + 1))
-        
-        return -1
+    def _union(self, author1, author2):
+        root1, root2 = self._find(author1), self._find(author2)
+        self.component_cache.pop(root1, None)
+        if root1 == root2:
+            return root1
+        self.component_cache.pop(root2, None)
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        return root1
 
-    def find_path(self, author1, author2):
+    def are_connected(self, author1, author2):
+        # O(α(n)) amortizado, sin recorrer el grafo
+        if author1 not in self.parent or author2 not in self.parent:
+            return False
+        return self._find(author1) == self._find(author2)
+
+    def _component_results(self, author):
+        return self.component_cache.setdefault(self._find(author), {'diameter': None, 'eccentricities': {}})
+
+    def degree(self, author):
+        return len(self.graph[author])
+
+    def _bidirectional_search(self, author1, author2, max_level=None):
+        # BFS desde ambos extremos, expandiendo siempre la frontera más
+        # pequeña una capa completa. Retorna el camino más corto o None; si se
+        # conoce un camino de longitud max_level, se deja de buscar al
+        # comprobar que no hay uno más corto y se retorna max_level.
         if author1 not in self.graph or author2 not in self.graph:
             return None
-        
         if author1 == author2:
             return [author1]
 
-        visited = {author1: None}
-        queue = deque([author1])
-        
-        while queue:
-            current_author = queue.popleft()
-            
-            for coauthor in self.graph[current_author]:
-                if coauthor not in visited:
-                    visited[coauthor] = current_author
-                    queue.append(coauthor)
-                    
-                    if coauthor == author2:
-                        # Reconstruir el camino
-                        path = []
-                        current = author2
-                        while current is not None:
-                            path.append(current)
-                            current = visited[current]
-                        return path[::-1]
-        
+        parents = ({author1: None}, {author2: None})
+        frontiers = ([author1], [author2])
+        depth = 0
+        while frontiers[0] and frontiers[1]:
+            if max_level is not None and depth + 1 >= max_level:
+                return max_level
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = parents[side], parents[1 - side]
+            next_frontier = []
+            best = None
+            for author in frontiers[side]:
+                for coauthor in self.graph[author]:
+                    if coauthor in own:
+                        continue
+                    own[coauthor] = author
+                    next_frontier.append(coauthor)
+                    if coauthor in other:
+                        # Hay que terminar la capa: el primer encuentro no es
+                        # necesariamente el de menor distancia al otro lado
+                        length = self._path_length(coauthor, other)
+                        if best is None or length < best[0]:
+                            best = (length, coauthor)
+            if best is not None:
+                return self._join_paths(best[1], parents)
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+            depth += 1
         return None
+
+    @staticmethod
+    def _path_length(author, parent):
+        length = 0
+        while parent[author] is not None:
+            author = parent[author]
+            length += 1
+        return length
+
+    @staticmethod
+    def _join_paths(meeting, parents):
+        # Camino de author1 hasta el encuentro y del encuentro hasta author2
+        path = []
+        current = meeting
+        while current is not None:
+            path.append(current)
+            current = parents[0][current]
+        path.reverse()
+        current = parents[1][meeting]
+        while current is not None:
+            path.append(current)
+            current = parents[1][current]
+        return path
+
+    def build_landmarks(self, k=16):
+        # Distancias BFS desde los k autores con más coautores. Por la
+        # desigualdad triangular, para cada landmark L:
+        #   |d(a, L) - d(b, L)| <= d(a, b) <= d(a, L) + d(L, b)
+        by_degree = sorted(self.graph, key=self.degree, reverse=True)
+        self.landmarks = []
+        for landmark in by_degree[:k]:
+            levels, _ = self._bfs_levels(landmark)
+            self.landmarks.append({author: level for level, authors in enumerate(levels) for author in authors})
+        return len(self.landmarks)
+
+    def estimate_connection_level(self, author1, author2):
+        # Cotas (inferior, superior) del nivel de conexión usando solo los
+        # landmarks; (-1, -1) si están en componentes distintas y superior
+        # None si ningún landmark comparte componente con ellos
+        if author1 not in self.graph or author2 not in self.graph:
+            return -1, -1
+        if author1 == author2:
+            return 0, 0
+        lower, upper = 1, None
+        for distances in self.landmarks:
+            d1, d2 = distances.get(author1), distances.get(author2)
+            if d1 is None and d2 is None:
+                continue
+            if d1 is None or d2 is None:
+                return -1, -1
+            lower = max(lower, abs(d1 - d2))
+            if upper is None or d1 + d2 < upper:
+                upper = d1 + d2
+        return lower, upper
+
+    def find_connection_level(self, author1, author2, exact=True):
+        # Con landmarks, si las cotas coinciden no hace falta buscar; con
+        # exact=False se responde la cota superior sin buscar
+        if author1 == author2 and author1 in self.graph:
+            return 0
+        if not self.are_connected(author1, author2):
+            return -1
+        upper = None
+        if self.landmarks:
+            lower, upper = self.estimate_connection_level(author1, author2)
+            if lower == upper:
+                return lower
+            if not exact and upper is not None:
+                return upper
+
+        result = self._bidirectional_search(author1, author2, upper)
+        if result is None:
+            return -1
+        if isinstance(result, int):
+            return result
+        return len(result) - 1
+
+    def find_path(self, author1, author2):
+        if author1 != author2 and not self.are_connected(author1, author2):
+            return None
+        return self._bidirectional_search(author1, author2)
         
-    def find_max_connection_level(self):
+    def _bfs_levels(self, source):
+        # Capas de la BFS desde source y el padre de cada autor visitado
+        levels = [[source]]
+        parent = {source: None}
+        while True:
+            next_level = []
+            for author in levels[-1]:
+                for coauthor in self.graph[author]:
+                    if coauthor not in parent:
+                        parent[coauthor] = author
+                        next_level.append(coauthor)
+            if not next_level:
+                return levels, parent
+            levels.append(next_level)
+
+    def _compute_eccentricity(self, source):
+        levels, _ = self._bfs_levels(source)
+        return len(levels) - 1, levels[-1][0]
+
+    def eccentricity(self, source):
+        cache = self._component_results(source)['eccentricities']
+        if source not in cache:
+            cache[source] = self._compute_eccentricity(source)
+        return cache[source]
+
+    def connected_components(self):
+        components = defaultdict(list)
+        for author in self.graph:
+            components[self._find(author)].append(author)
+        return list(components.values())
+
+    def _eccentricities(self, sources, executor, processes=1):
+        # Solo se calculan (en paralelo si son muchas) las que no están en caché
+        cache = self._component_results(sources[0])['eccentricities']
+        missing = [source for source in sources if source not in cache]
+        if executor is not None and len(missing) >= PARALLEL_MIN_FRINGE:
+            chunksize = max(1, len(missing) // (4 * processes))
+            cache.update(zip(missing, executor.map(_eccentricity, missing, chunksize=chunksize)))
+        else:
+            for source in missing:
+                cache[source] = self._compute_eccentricity(source)
+        return [cache[source] for source in sources]
+
+    def _component_diameter(self, component, executor=None, processes=1):
+        # El diámetro queda en caché hasta que add_paper modifique la componente
+        if len(component) == 1:
+            return 0, (component[0], component[0])
+        results = self._component_results(component[0])
+        if results['diameter'] is None:
+            results['diameter'] = self._ifub(component, executor, processes)
+        return results['diameter']
+
+    def _ifub(self, component, executor, processes=1):
+        # iFUB: se parte de un autor central y se recorren sus capas de la
+        # más lejana hacia adentro. Dos autores en capas < i están a lo sumo a
+        # distancia 2(i - 1), así que al superar esa cota se puede parar.
+
+        # Doble barrido: el punto medio del camino más largo encontrado sirve
+        # como centro y da una primera cota inferior
+        start = max(component, key=self.degree)
+        _, far = self.eccentricity(start)
+        levels, parent = self._bfs_levels(far)
+        lower, pair = len(levels) - 1, (far, levels[-1][0])
+        path = [levels[-1][0]]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        center = path[len(path) // 2]
+
+        levels, _ = self._bfs_levels(center)
+        i = len(levels) - 1
+        if i > lower:
+            lower, pair = i, (center, levels[-1][0])
+        upper = 2 * i
+
+        while upper > lower and i > 0:
+            fringe = levels[i]
+            for source, (ecc, farthest) in zip(fringe, self._eccentricities(fringe, executor, processes)):
+                if ecc > lower:
+                    lower, pair = ecc, (source, farthest)
+            if lower > 2 * (i - 1):
+                break
+            upper = 2 * (i - 1)
+            i -= 1
+
+        return lower, pair
+
+    def component_diameters(self, processes=None):
+        # Diámetro y par de autores extremos de cada componente conexa,
+        # ordenado de la componente más grande a la más pequeña
+        global _shared_graph
+        components = sorted(self.connected_components(), key=len, reverse=True)
+        # Solo las componentes sin diámetro en caché necesitan el pool
+        pending = [component for component in components
+                   if self._component_results(component[0])['diameter'] is None]
+        processes = processes or os.cpu_count() or 1
+        executor = None
+        try:
+            if processes > 1 and pending and len(pending[0]) >= PARALLEL_MIN_FRINGE:
+                if 'fork' in multiprocessing.get_all_start_methods():
+                    _shared_graph = self
+                    executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('fork'))
+                else:
+                    executor = ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self,))
+
+            results = []
+            for component in components:
+                diameter, pair = self._component_diameter(component, executor, processes)
+                results.append((diameter, pair, len(component)))
+            return results
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            # Sin esto el proceso principal mantendría vivo el grafo
+            _shared_graph = None
+
+    def find_max_connection_level(self, processes=None):
         max_level = 0
         max_pair = (None, None)
-        all_authors = list(self.all_authors)
-
-        for i in range(len(all_authors)):
-            for j in range(i + 1, len(all_authors)):
-                level = self.find_connection_level(all_authors[i], all_authors[j])
-                if level > max_level and level != -1:
-                    max_level = level
-                    max_pair = (all_authors[i], all_authors[j])
+
+        for diameter, pair, _ in self.component_diameters(processes):
+            if diameter > max_level:
+                max_level = diameter
+                max_pair = pair
                     
         return max_level, max_pair
 
-def load_and_process_excel(filepath):
-    df = pd.read_excel(filepath)
+class _CompactNeighbors:
+    # Vista de solo lectura con la interfaz de diccionario de AutorGraph.graph:
+    # autor -> coautores
 
-    graph = AutorGraph()
+    def __init__(self, graph):
+        self._graph = graph
 
-    for _, row in df.iterrows():
-        authors = [row['Autor 1'], row['Autor 2'], row['Autor 3']]
-        graph.add_paper(authors)
-        
+    def __contains__(self, author):
+        return author in self._graph.ids
+
+    def __iter__(self):
+        return iter(self._graph.names)
+
+    def __len__(self):
+        return len(self._graph.names)
+
+    def __getitem__(self, author):
+        i = self._graph.ids[author]
+        names = self._graph.names
+        return [names[j] for j in self._graph.neighbors(i).tolist()]
+
+class CompactAutorGraph(AutorGraph):
+    # Grafo inmutable en formato CSR: cada autor tiene un id entero y sus
+    # coautores son indices[indptr[i]:indptr[i + 1]]. Las BFS expanden la
+    # frontera completa de una vez con operaciones de NumPy.
+
+    def __init__(self, names, indptr, indices):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.indptr = indptr
+        self.indices = indices
+        self.graph = _CompactNeighbors(self)
+        self.landmarks = []
+        self.landmark_distances = None
+        self.component_cache = {}
+        # Componente de cada autor y autores de cada componente (se calculan
+        # una vez: el grafo no cambia)
+        self.labels = None
+        self.components = None
+
+    @property
+    def all_authors(self):
+        return self.ids.keys()
+
+    @classmethod
+    def from_edges(cls, names, sources, targets):
+        # sources[k] - targets[k] son ids de coautores en names; se agregan
+        # ambos sentidos, se eliminan lazos y repetidos, y se quitan los
+        # autores sin coautores (igual que en AutorGraph)
+        n = len(names)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        keep = sources != targets
+        sources, targets = sources[keep], targets[keep]
+        # Ordenar y comparar con el vecino es más rápido que np.unique aquí
+        keys = np.concatenate((sources * n + targets, targets * n + sources))
+        keys.sort()
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if keys.size else keys
+        sources, targets = keys // n, keys % n
+
+        degrees = np.bincount(sources, minlength=n)
+        connected = degrees > 0
+        if not connected.all():
+            new_ids = np.cumsum(connected) - 1
+            sources, targets = new_ids[sources], new_ids[targets]
+            names = [name for name, keep in zip(names, connected.tolist()) if keep]
+            degrees = degrees[connected]
+
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        return cls(list(names), indptr, targets.astype(np.int32))
+
+    @classmethod
+    def from_papers(cls, papers):
+        ids = {}
+        sources, targets = [], []
+        for authors in papers:
+            authors = [ids.setdefault(author, len(ids)) for author in authors if author]
+            for i, a in enumerate(authors):
+                for b in authors[i + 1:]:
+                    sources.append(a)
+                    targets.append(b)
+        return cls.from_edges(list(ids), sources, targets)
+
+    @classmethod
+    def from_autor_graph(cls, graph):
+        names = list(graph.graph)
+        ids = {name: i for i, name in enumerate(names)}
+        sources = np.repeat(np.arange(len(names)), [len(graph.graph[name]) for name in names])
+        targets = np.fromiter((ids[coauthor] for name in names for coauthor in graph.graph[name]),
+                              dtype=np.int64, count=len(sources))
+        return cls.from_edges(names, sources, targets)
+
+    def add_paper(self, authors):
+        raise TypeError("CompactAutorGraph es inmutable; use from_edges o from_papers")
+
+    def degree(self, author):
+        i = self.ids[author]
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def _expand(self, frontier):
+        # Todos los coautores de la frontera y, para cada uno, el autor de la
+        # frontera desde el que se llegó
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return self.indices[np.arange(total) + offsets], np.repeat(frontier, counts)
+
+    def _bfs_ids(self, source):
+        # Capas de la BFS como arreglos de ids y el padre de cada autor (-1 en
+        # la raíz y en los no alcanzados)
+        parent = np.full(len(self.names), -1, dtype=np.int32)
+        visited = np.zeros(len(self.names), dtype=bool)
+        visited[source] = True
+        levels = [np.array([source], dtype=np.int32)]
+        while True:
+            found, owners = self._expand(levels[-1])
+            mask = ~visited[found]
+            found, first = np.unique(found[mask], return_index=True)
+            if not found.size:
+                return levels, parent
+            visited[found] = True
+            parent[found] = owners[mask][first]
+            levels.append(found)
+
+    def _bfs_levels(self, source):
+        levels, parent = self._bfs_ids(self.ids[source])
+        names = self.names
+        parents = {source: None}
+        for level in levels[1:]:
+            for i in level.tolist():
+                parents[names[i]] = names[parent[i]]
+        return [[names[i] for i in level.tolist()] for level in levels], parents
+
+    def _distances(self, source):
+        distances = np.full(len(self.names), -1, dtype=np.int32)
+        distances[source] = 0
+        frontier = np.array([source], dtype=np.int32)
+        level = 0
+        while frontier.size:
+            level += 1
+            found, _ = self._expand(frontier)
+            frontier = np.unique(found[distances[found] < 0])
+            distances[frontier] = level
+        return distances
+
+    def _compute_eccentricity(self, source):
+        visited = np.zeros(len(self.names), dtype=bool)
+        frontier = np.array([self.ids[source]], dtype=np.int32)
+        visited[frontier] = True
+        level = 0
+        while True:
+            found, _ = self._expand(frontier)
+            found = np.unique(found[~visited[found]])
+            if not found.size:
+                return level, self.names[frontier[0]]
+            visited[found] = True
+            frontier = found
+            level += 1
+
+    def _label_components(self):
+        labels = np.full(len(self.names), -1, dtype=np.int32)
+        components = []
+        for start in range(len(self.names)):
+            if labels[start] < 0:
+                levels, _ = self._bfs_ids(start)
+                component = np.concatenate(levels)
+                labels[component] = len(components)
+                components.append(component)
+        self.labels, self.components = labels, components
+
+    def _find(self, author):
+        if self.labels is None:
+            self._label_components()
+        return int(self.labels[self.ids[author]])
+
+    def are_connected(self, author1, author2):
+        if author1 not in self.ids or author2 not in self.ids:
+            return False
+        return self._find(author1) == self._find(author2)
+
+    def connected_components(self):
+        if self.components is None:
+            self._label_components()
+        return [[self.names[i] for i in component.tolist()] for component in self.components]
+
+    def _bidirectional_search(self, author1, author2, max_level=None):
+        # Misma búsqueda que AutorGraph, con distancias y padres por lado en
+        # arreglos indexados por id
+        if author1 not in self.ids or author2 not in self.ids:
+            return None
+        if author1 == author2:
+            return [author1]
+
+        n = len(self.names)
+        ends = (self.ids[author1], self.ids[author2])
+        distances = (np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32))
+        parents = (np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32))
+        frontiers = [np.array([ends[0]], dtype=np.int32), np.array([ends[1]], dtype=np.int32)]
+        distances[0][ends[0]] = distances[1][ends[1]] = 0
+        depths = [0, 0]
+        while frontiers[0].size and frontiers[1].size:
+            if max_level is not None and depths[0] + depths[1] + 1 >= max_level:
+                return max_level
+            side = 0 if frontiers[0].size <= frontiers[1].size else 1
+            found, owners = self._expand(frontiers[side])
+            mask = distances[side][found] < 0
+            found, first = np.unique(found[mask], return_index=True)
+            depths[side] += 1
+            distances[side][found] = depths[side]
+            parents[side][found] = owners[mask][first]
+            meeting = found[distances[1 - side][found] >= 0]
+            if meeting.size:
+                best = int(meeting[np.argmin(distances[1 - side][meeting])])
+                return self._join_ids(best, ends, parents)
+            frontiers[side] = found
+        return None
+
+    def _join_ids(self, meeting, ends, parents):
+        path = [meeting]
+        while path[-1] != ends[0]:
+            path.append(int(parents[0][path[-1]]))
+        path.reverse()
+        current = meeting
+        while current != ends[1]:
+            current = int(parents[1][current])
+            path.append(current)
+        return [self.names[i] for i in path]
+
+    def build_landmarks(self, k=16):
+        # Matriz k x n de distancias (-1 si no se alcanza)
+        k = min(k, len(self.names))
+        degrees = np.diff(self.indptr)
+        order = np.argsort(-degrees, kind='stable')[:k]
+        self.landmarks = [self.names[i] for i in order.tolist()]
+        if k:
+            self.landmark_distances = np.vstack([self._distances(i) for i in order.tolist()])
+        return k
+
+    def estimate_connection_level(self, author1, author2):
+        if author1 not in self.ids or author2 not in self.ids:
+            return -1, -1
+        if author1 == author2:
+            return 0, 0
+        d1 = self.landmark_distances[:, self.ids[author1]]
+        d2 = self.landmark_distances[:, self.ids[author2]]
+        if ((d1 < 0) != (d2 < 0)).any():
+            return -1, -1
+        shared = d1 >= 0
+        if not shared.any():
+            return 1, None
+        d1, d2 = d1[shared], d2[shared]
+        return max(1, int(np.abs(d1 - d2).max())), int((d1 + d2).min())
+
+def _read_table(filepath):
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == '.csv':
+        return pd.read_csv(filepath, dtype=str)
+    if extension == '.parquet':
+        return _authors_as_text(pd.read_parquet(filepath))
+    return pd.read_excel(filepath, dtype=str)
+
+def _authors_as_text(df):
+    # Parquet conserva el tipo de cada columna: los autores se pasan a texto
+    # como con dtype=str en CSV y Excel, y los nulos siguen siendo nulos
+    for column in _author_columns(df):
+        df[column] = df[column].map(str, na_action='ignore').astype(object)
+    return df
+
+def _author_columns(df):
+    # Columnas 'Autor 1', 'Autor 2', ... en orden numérico
+    columns = [column for column in df.columns if AUTHOR_COLUMN.fullmatch(str(column))]
+    if not columns:
+        raise ValueError("El archivo no tiene columnas 'Autor N'")
+    return sorted(columns, key=lambda column: int(AUTHOR_COLUMN.fullmatch(str(column)).group(1)))
+
+def _edges_from_columns(df, columns):
+    # Un id por autor distinto (factorize sobre todas las columnas a la vez,
+    # sin contar nulos) y una arista por cada par de columnas con autor en la
+    # misma fila
+    codes, names = pd.factorize(df[columns].to_numpy().ravel(order='F'))
+    codes = codes.reshape(len(columns), len(df))
+    # Las celdas en blanco cuentan como nulas
+    blank = np.array([not str(name).strip() for name in names], dtype=bool)
+    if blank.any():
+        codes[(codes >= 0) & blank[codes]] = -1
+    sources, targets = [], []
+    for i in range(len(columns)):
+        for j in range(i + 1, len(columns)):
+            both = (codes[i] >= 0) & (codes[j] >= 0)
+            sources.append(codes[i][both])
+            targets.append(codes[j][both])
+    if not sources:
+        return list(names), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return list(names), np.concatenate(sources), np.concatenate(targets)
+
+def _load_graph_cache(cache_path, stat):
+    try:
+        with np.load(cache_path) as data:
+            if (data['version'] != GRAPH_CACHE_VERSION or data['mtime_ns'] != stat.st_mtime_ns
+                    or data['size'] != stat.st_size):
+                return None
+            names = data['names'].tobytes().decode('utf-8').split('\n') if len(data['indptr']) > 1 else []
+            return CompactAutorGraph(names, data['indptr'], data['indices'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _save_graph_cache(cache_path, stat, graph):
+    temporary = f"{cache_path}.tmp"
+    try:
+        with open(temporary, 'wb') as file:
+            np.savez(file, version=GRAPH_CACHE_VERSION, mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                     names=np.frombuffer('\n'.join(graph.names).encode('utf-8'), dtype=np.uint8),
+                     indptr=graph.indptr, indices=graph.indices)
+        os.replace(temporary, cache_path)
+    except OSError as error:
+        print(f"Advertencia: no se pudo guardar la caché {cache_path}: {error}")
+
+def _autor_graph_from_csr(compact):
+    graph = AutorGraph()
+    names = compact.names
+    for i, name in enumerate(names):
+        graph.graph[name] = {names[j] for j in compact.neighbors(i).tolist()}
+    graph.all_authors = set(names)
+    for component in compact.connected_components():
+        graph.parent.update(dict.fromkeys(component, component[0]))
+        graph.size[component[0]] = len(component)
     return graph
 
-def main(excel_path):
+def load_and_process_excel(filepath, compact=False, cache=True):
+    # Acepta Excel, CSV o Parquet según la extensión. El grafo leído se guarda
+    # en <archivo>.npz y se reutiliza mientras el archivo no cambie.
+    stat = os.stat(filepath)
+    cache_path = f"{filepath}.npz"
+    graph = _load_graph_cache(cache_path, stat) if cache else None
+    if graph is None:
+        df = _read_table(filepath)
+        names, sources, targets = _edges_from_columns(df, _author_columns(df))
+        graph = CompactAutorGraph.from_edges(names, sources, targets)
+        if cache:
+            _save_graph_cache(cache_path, stat, graph)
+
+    return graph if compact else _autor_graph_from_csr(graph)
+
+def main(excel_path, compact=False):
     # Crear el grafo desde el archivo Excel
     print("Cargando y procesando el archivo Excel...")
-    graph = load_and_process_excel(excel_path)
+    graph = load_and_process_excel(excel_path, compact)
+    graph.build_landmarks()
     
     while True:
         print("\nMenú:")
@@ -117,9 +712,17 @@ def main(excel_path):
                 print(f"\nNo existe conexión entre {autor1} y {autor2}")
                 
         elif opcion == '2':
-            max_nivel, (autor1, autor2) = graph.find_max_connection_level()
+            componentes = graph.component_diameters()
+            max_nivel, (autor1, autor2) = max(((d, par) for d, par, _ in componentes),
+                                              key=lambda x: x[0], default=(0, (None, None)))
             print(f"\nEl nivel máximo de conexión en el grafo es: {max_nivel}")
             print(f"Entre los autores: {autor1} y {autor2}")
+
+            print(f"\nComponentes conexas: {len(componentes)}")
+            for diametro, (extremo1, extremo2), tamano in componentes[:10]:
+                print(f"- {tamano} autores, diámetro {diametro}: {extremo1} ↔ {extremo2}")
+            if len(componentes) > 10:
+                print(f"... y {len(componentes) - 10} componentes más pequeñas")
             
         elif opcion == '3':
             autor1 = input("Ingrese el nombre del primer autor: ")
@@ -0,0 +1,200 @@
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from binario import comprimir_binario, descomprimir_binario
+from flujo import comprimir_archivo, descomprimir_archivo
+from main import Diccionario, calcular_tamano, comprimir_texto, descomprimir_texto
+from paralelo import comprimir_paralelo, descomprimir_paralelo
+
+VOCABULARIO_BASE = (
+    "el la de que y a en un ser se no haber por con su para como estar tener le lo todo "
+    "pero más hacer o poder decir este ir otro ese si me ya ver porque dar cuando él muy "
+    "sin vez mucho saber qué sobre mi alguno mismo yo también hasta año dos querer entre "
+    "así primero desde grande eso ni nos llegar pasar tiempo ella sí día uno bien poco "
+    "deber entonces poner cosa tanto hombre parecer nuestro tan donde ahora parte después "
+    "vida quedar siempre creer hablar llevar dejar nada cada seguir menos nuevo encontrar"
+).split()
+
+
+def generar_corpus(tamano_bytes, tamano_vocabulario=20000, proporcion_numeros=0.0, semilla=42):
+    # Texto sintético con frecuencias de Zipf: unas pocas palabras muy
+    # frecuentes y muchas raras. Las oraciones empiezan con mayúscula y
+    # terminan con punto. Por defecto no se usan dígitos ni '^' para que el
+    # formato de texto pueda recuperar el original sin ambigüedad;
+    # proporcion_numeros agrega números (años, cantidades) entre las palabras.
+    aleatorio = random.Random(semilla)
+    vocabulario = list(VOCABULARIO_BASE)
+    letras = "abcdefghijklmnopqrstuvwxyzáéíóúñ"
+    while len(vocabulario) < tamano_vocabulario:
+        vocabulario.append("".join(aleatorio.choice(letras) for _ in range(aleatorio.randint(3, 12))))
+    pesos_acumulados = list(itertools.accumulate(1 / rango for rango in range(1, len(vocabulario) + 1)))
+
+    oraciones = []
+    tamano = 0
+    while tamano < tamano_bytes:
+        palabras = aleatorio.choices(vocabulario, cum_weights=pesos_acumulados, k=aleatorio.randint(5, 25))
+        palabras[0] = palabras[0].capitalize()
+        for i in range(1, len(palabras)):
+            if aleatorio.random() < proporcion_numeros:
+                palabras[i] = str(aleatorio.randint(1, 2024))
+        for i in range(2, len(palabras), 7):
+            palabras[i] += ","
+        oracion = " ".join(palabras) + ("." if aleatorio.random() < 0.9 else ".\n")
+        oraciones.append(oracion)
+        tamano += calcular_tamano(oracion) + 1
+    return " ".join(oraciones)
+
+
+def cronometrar(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def benchmark_velocidad(tamanos):
+    tamanos = tamanos or [1, 8]
+    print(f"{'Tamaño (MB)':>12} {'Comprimido (%)':>15} {'Compresión (MB/s)':>18} "
+          f"{'Descompresión (MB/s)':>21}")
+    for megabytes in tamanos:
+        texto = generar_corpus(megabytes * 2**20)
+        bytes_original = calcular_tamano(texto)
+        diccionario = Diccionario()
+        comprimido, compresion = cronometrar(comprimir_texto, texto, diccionario)
+        descomprimido, descompresion = cronometrar(descomprimir_texto, comprimido, diccionario)
+        if descomprimido != texto:
+            raise AssertionError(f"El texto de {megabytes} MB no se recuperó igual")
+        porcentaje = calcular_tamano(comprimido) / bytes_original * 100
+        print(f"{megabytes:>12} {porcentaje:>15.1f} {bytes_original / 2**20 / compresion:>18.2f} "
+              f"{bytes_original / 2**20 / descompresion:>21.2f}")
+
+
+def benchmark_binario(tamanos):
+    # Formato de texto contra formato binario sobre un corpus con números: en
+    # el formato de texto los dígitos del original se confunden con códigos
+    tamanos = tamanos or [1, 8]
+    print(f"{'Tamaño (MB)':>12} {'Formato':>8} {'Comprimido (%)':>15} {'Compresión (MB/s)':>18} "
+          f"{'Descompresión (MB/s)':>21} {'Ida y vuelta':>13}")
+    for megabytes in tamanos:
+        texto = generar_corpus(megabytes * 2**20, proporcion_numeros=0.02)
+        bytes_original = calcular_tamano(texto)
+        for nombre, comprimir, descomprimir, tamano in (
+                ('texto', comprimir_texto, descomprimir_texto, calcular_tamano),
+                ('binario', comprimir_binario, descomprimir_binario, len)):
+            diccionario = Diccionario()
+            comprimido, compresion = cronometrar(comprimir, texto, diccionario)
+            descomprimido, descompresion = cronometrar(descomprimir, comprimido, diccionario)
+            porcentaje = tamano(comprimido) / bytes_original * 100
+            ida_y_vuelta = "sí" if descomprimido == texto else "no"
+            print(f"{megabytes:>12} {nombre:>8} {porcentaje:>15.1f} "
+                  f"{bytes_original / 2**20 / compresion:>18.2f} "
+                  f"{bytes_original / 2**20 / descompresion:>21.2f} {ida_y_vuelta:>13}")
+
+
+def escribir_corpus(nombre_archivo, megabytes, megabytes_por_parte=4):
+    # El corpus se genera por partes para no tenerlo completo en memoria
+    with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
+        for parte in range(0, megabytes, megabytes_por_parte):
+            archivo.write(generar_corpus(min(megabytes_por_parte, megabytes - parte) * 2**20, semilla=parte))
+
+
+def medir_memoria(funcion, *args):
+    tracemalloc.start()
+    _, segundos = cronometrar(funcion, *args)
+    pico = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def comprimir_en_memoria(ruta_entrada, ruta_salida):
+    with open(ruta_entrada, 'r', encoding='utf-8', newline='') as entrada:
+        datos = comprimir_binario(entrada.read(), Diccionario())
+    with open(ruta_salida, 'wb') as salida:
+        salida.write(datos)
+
+
+def benchmark_flujo(tamanos):
+    # Compresión de archivos por bloques contra leer el archivo completo; la
+    # memoria es el pico medido con tracemalloc
+    tamanos = tamanos or [8, 32]
+    with tempfile.TemporaryDirectory() as directorio:
+        directorio = Path(directorio)
+        print(f"{'Tamaño (MB)':>12} {'Modo':>10} {'Comprimido (%)':>15} {'Compresión (MB/s)':>18} "
+              f"{'Memoria (MB)':>13} {'Descompresión (MB/s)':>21} {'Memoria (MB)':>13}")
+        for megabytes in tamanos:
+            original = directorio / f"corpus_{megabytes}.txt"
+            escribir_corpus(original, megabytes)
+            bytes_original = os.path.getsize(original)
+
+            comprimido = directorio / "completo.dic"
+            compresion, memoria = medir_memoria(comprimir_en_memoria, original, comprimido)
+            porcentaje = os.path.getsize(comprimido) / bytes_original * 100
+            print(f"{megabytes:>12} {'completo':>10} {porcentaje:>15.1f} "
+                  f"{bytes_original / 2**20 / compresion:>18.2f} {memoria:>13.1f} {'-':>21} {'-':>13}")
+
+            comprimido = directorio / "bloques.dicf"
+            recuperado = directorio / "recuperado.txt"
+            compresion, memoria = medir_memoria(comprimir_archivo, original, comprimido)
+            descompresion, memoria_descompresion = medir_memoria(descomprimir_archivo, comprimido, recuperado)
+            if recuperado.read_bytes() != original.read_bytes():
+                raise AssertionError(f"El archivo de {megabytes} MB no se recuperó igual")
+            porcentaje = os.path.getsize(comprimido) / bytes_original * 100
+            print(f"{megabytes:>12} {'bloques':>10} {porcentaje:>15.1f} "
+                  f"{bytes_original / 2**20 / compresion:>18.2f} {memoria:>13.1f} "
+                  f"{bytes_original / 2**20 / descompresion:>21.2f} {memoria_descompresion:>13.1f}")
+
+
+def cantidades_procesos():
+    # 1, 2, 4, ... hasta la cantidad de núcleos, que siempre se incluye
+    nucleos = os.cpu_count() or 1
+    cantidades = [1]
+    while cantidades[-1] * 2 < nucleos:
+        cantidades.append(cantidades[-1] * 2)
+    if cantidades[-1] != nucleos:
+        cantidades.append(nucleos)
+    return cantidades
+
+
+def benchmark_paralelo(tamanos):
+    # Escalado de comprimir_paralelo y descomprimir_paralelo de 1 a N procesos
+    tamanos = tamanos or [32]
+    with tempfile.TemporaryDirectory() as directorio:
+        directorio = Path(directorio)
+        print(f"{'Tamaño (MB)':>12} {'Procesos':>9} {'Comprimido (%)':>15} {'Compresión (MB/s)':>18} "
+              f"{'Aceleración':>12} {'Descompresión (MB/s)':>21} {'Aceleración':>12}")
+        for megabytes in tamanos:
+            original = directorio / f"corpus_{megabytes}.txt"
+            escribir_corpus(original, megabytes)
+            bytes_original = os.path.getsize(original)
+            comprimido = directorio / "indexado.dici"
+            recuperado = directorio / "recuperado.txt"
+            base = None
+            for procesos in cantidades_procesos():
+                _, compresion = cronometrar(comprimir_paralelo, original, comprimido, procesos)
+                _, descompresion = cronometrar(descomprimir_paralelo, comprimido, recuperado, procesos)
+                if recuperado.read_bytes() != original.read_bytes():
+                    raise AssertionError(f"El archivo de {megabytes} MB no se recuperó igual con {procesos} procesos")
+                base = base or (compresion, descompresion)
+                porcentaje = os.path.getsize(comprimido) / bytes_original * 100
+                print(f"{megabytes:>12} {procesos:>9} {porcentaje:>15.1f} "
+                      f"{bytes_original / 2**20 / compresion:>18.2f} {base[0] / compresion:>11.2f}x "
+                      f"{bytes_original / 2**20 / descompresion:>21.2f} {base[1] / descompresion:>11.2f}x")
+
+
+BENCHMARKS = {'velocidad': benchmark_velocidad, 'binario': benchmark_binario, 'flujo': benchmark_flujo,
+              'paralelo': benchmark_paralelo}
+
+
+def main():
+    argumentos = sys.argv[1:]
+    modo = argumentos.pop(0) if argumentos and argumentos[0] in BENCHMARKS else 'velocidad'
+    BENCHMARKS[modo]([int(n) for n in argumentos])
+
+
+if __name__ == "__main__":
+    main()
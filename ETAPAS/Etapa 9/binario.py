@@ -0,0 +1,209 @@
+import itertools
+import re
+from collections import Counter
+
+from main import tokenizar
+
+# Formato binario del texto comprimido:
+#   MAGIA, y como varints: número de palabras, tamaño del diccionario usado,
+#   tamaño de la tabla de separadores y tamaño de cada sección; después las
+#   secciones:
+#   - tabla de separadores: cada separador distinto salvo el espacio simple
+#     (longitud + UTF-8), ordenados por frecuencia
+#   - mayúsculas: 2 bits por palabra (ver MINUSCULA, CAPITALIZADA, MAYUSCULA)
+#   - espacios: 1 bit por separador, encendido si no es un espacio simple
+#   - palabras: un varint por palabra. Un valor v menor que el tamaño D del
+#     diccionario es la palabra con código v (los códigos siguen el orden de
+#     frecuencia, así las palabras frecuentes ocupan un byte); v >= D es un
+#     literal de v - D caracteres.
+#   - literales: las palabras fuera del diccionario, seguidas, en UTF-8
+#   - separadores: un varint por separador que no es un espacio simple, con
+#     su posición en la tabla
+MAGIA = b"DIC\x01"
+ESPACIO = " "
+MINUSCULA = 0
+CAPITALIZADA = 1
+MAYUSCULA = 2
+SECCIONES = 6
+
+# Un varint completo: bytes con el bit alto encendido y uno final sin él
+PATRON_VARINT = re.compile(rb"[\x80-\xff]*[\x00-\x7f]")
+# Las 4 marcas de mayúsculas y los 8 bits de espacios guardados en cada byte
+MARCAS_POR_BYTE = [tuple(byte >> desplazamiento & 3 for desplazamiento in range(0, 8, 2))
+                   for byte in range(256)]
+BITS_POR_BYTE = [tuple(byte >> desplazamiento & 1 for desplazamiento in range(8))
+                 for byte in range(256)]
+DIGITOS = bytes.maketrans(bytes(range(4)), b"0123")
+
+
+def codificar_varint(numero):
+    resultado = bytearray()
+    while numero >= 0x80:
+        resultado.append(numero & 0x7F | 0x80)
+        numero >>= 7
+    resultado.append(numero)
+    return bytes(resultado)
+
+
+def leer_varint(datos, posicion):
+    numero = desplazamiento = 0
+    while True:
+        byte = datos[posicion]
+        posicion += 1
+        numero |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return numero, posicion
+        desplazamiento += 7
+
+
+def marca_mayusculas(palabra, base):
+    # Marca con la que base (en minúsculas) reproduce exactamente la palabra,
+    # o None si ninguna sirve y la palabra debe guardarse como literal
+    if palabra == base:
+        return MINUSCULA
+    if palabra == base.capitalize():
+        return CAPITALIZADA
+    if palabra == base.upper():
+        return MAYUSCULA
+    return None
+
+
+def aplicar_mayusculas(base, marca):
+    if marca == CAPITALIZADA:
+        return base.capitalize()
+    if marca == MAYUSCULA:
+        return base.upper()
+    return base
+
+
+def empaquetar(valores, bits):
+    # Empaqueta valores de 1 o 2 bits, el primero en los bits bajos del primer
+    # byte. Los valores se escriben como dígitos en base 2 o 4 (al revés) y
+    # int() los convierte de una vez.
+    if not valores:
+        return b""
+    digitos = bytes(valores).translate(DIGITOS)[::-1]
+    return int(digitos, 2 ** bits).to_bytes(-(-len(valores) * bits // 8), "little")
+
+
+def desempaquetar_marcas(datos, cantidad):
+    return list(itertools.chain.from_iterable(map(MARCAS_POR_BYTE.__getitem__, datos)))[:cantidad]
+
+
+def desempaquetar_bits(datos, cantidad):
+    return list(itertools.chain.from_iterable(map(BITS_POR_BYTE.__getitem__, datos)))[:cantidad]
+
+
+def codificar_partes(partes, codigos):
+    # partes viene de tokenizar; codigos es palabra_a_codigo del diccionario.
+    # Cada palabra y cada separador distintos se codifican una sola vez.
+    palabras = partes[1::2]
+    separadores = partes[0::2]
+    tamano_diccionario = len(codigos)
+
+    # Los varints se guardan como str latin-1: unir millones de str cortos es
+    # bastante más rápido que unir bytes
+    varint_de = {}
+    marca_de = {}
+    literales = set()
+    for palabra in set(palabras):
+        base = palabra.lower()
+        codigo = codigos.get(base)
+        marca = marca_mayusculas(palabra, base) if codigo is not None else None
+        if marca is None:
+            varint_de[palabra] = codificar_varint(tamano_diccionario + len(palabra)).decode("latin-1")
+            marca_de[palabra] = MINUSCULA
+            literales.add(palabra)
+        else:
+            varint_de[palabra] = codificar_varint(int(codigo)).decode("latin-1")
+            marca_de[palabra] = marca
+
+    otros = list(filter(ESPACIO.__ne__, separadores))
+    tabla = [separador for separador, _ in Counter(otros).most_common()]
+    posicion_de = {separador: codificar_varint(i).decode("latin-1") for i, separador in enumerate(tabla)}
+
+    secciones = [
+        b"".join(codificar_varint(len(separador.encode("utf-8"))) + separador.encode("utf-8")
+                 for separador in tabla),
+        empaquetar(list(map(marca_de.__getitem__, palabras)), 2),
+        empaquetar(list(map(ESPACIO.__ne__, separadores)), 1),
+        "".join(map(varint_de.__getitem__, palabras)).encode("latin-1"),
+        "".join(filter(literales.__contains__, palabras)).encode("utf-8"),
+        "".join(map(posicion_de.__getitem__, otros)).encode("latin-1"),
+    ]
+    cabecera = [MAGIA, codificar_varint(len(palabras)), codificar_varint(tamano_diccionario),
+                codificar_varint(len(tabla))]
+    cabecera.extend(codificar_varint(len(seccion)) for seccion in secciones)
+    return b"".join(cabecera + secciones)
+
+
+def decodificar_partes(datos, codigo_a_palabra, posicion=0):
+    # Inverso de codificar_partes: retorna el texto y la posición siguiente
+    if datos[posicion:posicion + len(MAGIA)] != MAGIA:
+        raise ValueError("Los datos no tienen el formato binario del compresor")
+    posicion += len(MAGIA)
+    cantidad_palabras, posicion = leer_varint(datos, posicion)
+    tamano_diccionario, posicion = leer_varint(datos, posicion)
+    cantidad_separadores, posicion = leer_varint(datos, posicion)
+    if tamano_diccionario != len(codigo_a_palabra):
+        raise ValueError("El diccionario no es el que se usó para comprimir")
+    tamanos = []
+    for _ in range(SECCIONES):
+        tamano, posicion = leer_varint(datos, posicion)
+        tamanos.append(tamano)
+    secciones = []
+    for tamano in tamanos:
+        secciones.append(bytes(datos[posicion:posicion + tamano]))
+        posicion += tamano
+    seccion_tabla, seccion_marcas, seccion_espacios, seccion_palabras, seccion_literales, seccion_separadores = secciones
+
+    tabla = {}
+    inicio = 0
+    for i in range(cantidad_separadores):
+        longitud, inicio = leer_varint(seccion_tabla, inicio)
+        tabla[codificar_varint(i)] = seccion_tabla[inicio:inicio + longitud].decode("utf-8")
+        inicio += longitud
+
+    # Cada combinación (varint, marca) de una palabra del diccionario se
+    # resuelve con una sola búsqueda; los literales quedan como None
+    palabra_de = {}
+    for codigo, base in codigo_a_palabra.items():
+        varint = codificar_varint(int(codigo))
+        for marca in (MINUSCULA, CAPITALIZADA, MAYUSCULA):
+            palabra_de[varint, marca] = aplicar_mayusculas(base, marca)
+
+    varints = PATRON_VARINT.findall(seccion_palabras)
+    marcas = desempaquetar_marcas(seccion_marcas, cantidad_palabras)
+    palabras = list(map(palabra_de.get, zip(varints, marcas)))
+    if seccion_literales:
+        literales = seccion_literales.decode("utf-8")
+        longitud_de = {}
+        inicio = 0
+        for i in [i for i, palabra in enumerate(palabras) if palabra is None]:
+            longitud = longitud_de.get(varints[i])
+            if longitud is None:
+                longitud = longitud_de[varints[i]] = leer_varint(varints[i], 0)[0] - tamano_diccionario
+            palabras[i] = literales[inicio:inicio + longitud]
+            inicio += longitud
+
+    otros = iter(map(tabla.__getitem__, PATRON_VARINT.findall(seccion_separadores)))
+    partes = [None] * (2 * cantidad_palabras + 1)
+    partes[0::2] = [next(otros) if bit else ESPACIO
+                    for bit in desempaquetar_bits(seccion_espacios, cantidad_palabras + 1)]
+    partes[1::2] = palabras
+    return "".join(partes), posicion
+
+
+def comprimir_binario(texto, diccionario):
+    # Igual que comprimir_texto, pero con salida binaria que siempre se puede
+    # descomprimir al texto original (los dígitos y '^' del texto no se
+    # confunden con códigos)
+    partes = tokenizar(texto)
+    diccionario.contar_palabras(partes[1::2])
+    diccionario.optimizar_diccionario()
+    return codificar_partes(partes, diccionario.palabra_a_codigo)
+
+
+def descomprimir_binario(datos, diccionario):
+    texto, _ = decodificar_partes(datos, diccionario.codigo_a_palabra)
+    return texto
@@ -0,0 +1,148 @@
+import argparse
+import codecs
+import io
+
+from binario import codificar_partes, codificar_varint, decodificar_partes
+from main import Diccionario, tokenizar
+
+# Formato de archivo comprimido:
+#   MAGIA_FLUJO, cantidad de palabras del diccionario y cada palabra
+#   (longitud + UTF-8) en orden de código; después cada bloque como su
+#   tamaño en bytes (varint) seguido del bloque en el formato de binario.py;
+#   un tamaño 0 marca el final.
+MAGIA_FLUJO = b"DICF\x01"
+TAMANO_BLOQUE = 1 << 20
+TAMANO_MUESTRA = 8 << 20
+BLOQUES_MUESTRA = 8
+
+
+def muestrear_frecuencias(entrada, diccionario, tamano_muestra=TAMANO_MUESTRA):
+    # Primera pasada acotada: cuenta las palabras de hasta tamano_muestra
+    # bytes. Si el archivo permite seek, la muestra son BLOQUES_MUESTRA
+    # ventanas repartidas a lo largo del archivo y se vuelve al inicio; si no,
+    # es el comienzo del flujo, que se retorna para comprimirlo después.
+    if entrada.seekable():
+        inicio = entrada.tell()
+        total = entrada.seek(0, io.SEEK_END) - inicio
+        ventana = max(1, min(total, tamano_muestra) // BLOQUES_MUESTRA)
+        for i in range(BLOQUES_MUESTRA):
+            entrada.seek(inicio + total * i // BLOQUES_MUESTRA)
+            # Los extremos de cada ventana pueden cortar caracteres o palabras;
+            # para estimar frecuencias no importa
+            diccionario.actualizar_frecuencias(entrada.read(ventana).decode('utf-8', errors='ignore'))
+        entrada.seek(inicio)
+        return b""
+    prefijo = entrada.read(tamano_muestra)
+    diccionario.actualizar_frecuencias(prefijo.decode('utf-8', errors='ignore'))
+    return prefijo
+
+
+def leer_bloques_texto(entrada, prefijo=b"", tamano_bloque=TAMANO_BLOQUE):
+    # Bloques de texto que nunca cortan una palabra: si un bloque termina en
+    # medio de una palabra, esa palabra pasa al bloque siguiente
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    pendiente = ""
+    fuentes = [io.BytesIO(prefijo), entrada]
+    for fuente in fuentes:
+        while True:
+            datos = fuente.read(tamano_bloque)
+            if not datos:
+                break
+            partes = tokenizar(pendiente + decodificador.decode(datos))
+            if partes[-1] == "" and len(partes) > 1:
+                pendiente = partes[-2]
+                partes = partes[:-2]
+            else:
+                pendiente = ""
+            if len(partes) > 1 or partes[0]:
+                yield partes
+    final = pendiente + decodificador.decode(b"", final=True)
+    if final:
+        yield tokenizar(final)
+
+
+def escribir_diccionario(salida, codigo_a_palabra):
+    salida.write(codificar_varint(len(codigo_a_palabra)))
+    for i in range(len(codigo_a_palabra)):
+        palabra = codigo_a_palabra[str(i)].encode('utf-8')
+        salida.write(codificar_varint(len(palabra)) + palabra)
+
+
+def leer_varint_archivo(entrada):
+    numero = desplazamiento = 0
+    while True:
+        byte = entrada.read(1)
+        if not byte:
+            raise EOFError("El archivo comprimido está truncado")
+        numero |= (byte[0] & 0x7F) << desplazamiento
+        if byte[0] < 0x80:
+            return numero
+        desplazamiento += 7
+
+
+def leer_diccionario(entrada):
+    codigo_a_palabra = {}
+    for i in range(leer_varint_archivo(entrada)):
+        codigo_a_palabra[str(i)] = entrada.read(leer_varint_archivo(entrada)).decode('utf-8')
+    return codigo_a_palabra
+
+
+def comprimir_flujo(entrada, salida, tamano_bloque=TAMANO_BLOQUE, tamano_muestra=TAMANO_MUESTRA):
+    # entrada y salida son archivos binarios. La memoria usada depende de
+    # tamano_bloque y tamano_muestra, no del tamaño del archivo.
+    diccionario = Diccionario()
+    prefijo = muestrear_frecuencias(entrada, diccionario, tamano_muestra)
+    diccionario.optimizar_diccionario()
+
+    salida.write(MAGIA_FLUJO)
+    escribir_diccionario(salida, diccionario.codigo_a_palabra)
+    for partes in leer_bloques_texto(entrada, prefijo, tamano_bloque):
+        bloque = codificar_partes(partes, diccionario.palabra_a_codigo)
+        salida.write(codificar_varint(len(bloque)))
+        salida.write(bloque)
+    salida.write(codificar_varint(0))
+    return diccionario
+
+
+def descomprimir_flujo(entrada, salida):
+    # El diccionario se lee de la cabecera: no hace falta el Diccionario con
+    # el que se comprimió
+    if entrada.read(len(MAGIA_FLUJO)) != MAGIA_FLUJO:
+        raise ValueError("El archivo no tiene el formato del compresor por bloques")
+    codigo_a_palabra = leer_diccionario(entrada)
+    while True:
+        tamano = leer_varint_archivo(entrada)
+        if tamano == 0:
+            break
+        bloque = entrada.read(tamano)
+        if len(bloque) < tamano:
+            raise EOFError("El archivo comprimido está truncado")
+        texto, _ = decodificar_partes(bloque, codigo_a_palabra)
+        salida.write(texto.encode('utf-8'))
+
+
+def comprimir_archivo(ruta_entrada, ruta_salida, tamano_bloque=TAMANO_BLOQUE):
+    with open(ruta_entrada, 'rb') as entrada, open(ruta_salida, 'wb') as salida:
+        comprimir_flujo(entrada, salida, tamano_bloque)
+
+
+def descomprimir_archivo(ruta_entrada, ruta_salida):
+    with open(ruta_entrada, 'rb') as entrada, open(ruta_salida, 'wb') as salida:
+        descomprimir_flujo(entrada, salida)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprime o descomprime archivos de texto por bloques.")
+    parser.add_argument('accion', choices=['comprimir', 'descomprimir'])
+    parser.add_argument('entrada')
+    parser.add_argument('salida')
+    parser.add_argument('--bloque', type=int, default=TAMANO_BLOQUE, help="tamaño de bloque en bytes")
+    argumentos = parser.parse_args()
+    if argumentos.accion == 'comprimir':
+        comprimir_archivo(argumentos.entrada, argumentos.salida, argumentos.bloque)
+    else:
+        descomprimir_archivo(argumentos.entrada, argumentos.salida)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,21 @@
+import heapq
+import re
 from collections import Counter
 
+# Una palabra es una secuencia de letras, dígitos o apóstrofos (los mismos
+# caracteres que acepta str.isalnum() más "'"). Si el texto no tiene "_" se
+# usa la clase [\w'], equivalente en ese caso y bastante más rápida.
+PATRON_PALABRA = re.compile(r"((?:[^\W_]|')+)")
+PATRON_PALABRA_SIN_GUION_BAJO = re.compile(r"([\w']+)")
+# Un código numérico, opcionalmente seguido del indicador de mayúscula
+PATRON_CODIGO = re.compile(r"(\d+\^?)")
+
+def tokenizar(texto):
+    # Lista alternada [separador, palabra, separador, ..., separador]: las
+    # palabras quedan en las posiciones impares
+    patron = PATRON_PALABRA if "_" in texto else PATRON_PALABRA_SIN_GUION_BAJO
+    return patron.split(texto)
+
 class Diccionario:
     def __init__(self):
         self.palabra_a_codigo = {}
@@ -23,13 +39,19 @@ class Diccionario:
         return self.codigo_a_palabra.get(codigo, codigo)
 
     def actualizar_frecuencias(self, texto):
-        palabras = texto.lower().split()
-        self.frecuencias.update(palabras)
+        self.contar_palabras(tokenizar(texto)[1::2])
+
+    def contar_palabras(self, palabras):
+        # Se cuentan primero las palabras tal como aparecen y solo se pasan a
+        # minúsculas las distintas
+        for palabra, cantidad in Counter(palabras).items():
+            self.frecuencias[palabra.lower()] += cantidad
 
     def optimizar_diccionario(self):
-        palabras_comunes = sorted(self.frecuencias, key=self.frecuencias.get, reverse=True)[:1000]
-        palabras_existentes = set(self.palabra_a_codigo.keys())
-        palabras_retenidas = sorted(palabras_existentes, key=lambda palabra: self.frecuencias.get(palabra, 0), reverse=True)[:500]
+        # most_common y nlargest usan un heap de tamaño acotado en lugar de
+        # ordenar todas las frecuencias
+        palabras_comunes = [palabra for palabra, _ in self.frecuencias.most_common(1000)]
+        palabras_retenidas = heapq.nlargest(500, self.palabra_a_codigo, key=lambda palabra: self.frecuencias.get(palabra, 0))
         self.palabra_a_codigo = {}
         self.codigo_a_palabra = {}
         self.codigo_actual = 0
@@ -40,61 +62,36 @@ class Diccionario:
                 self.agregar_palabra(palabra)
 
 def comprimir_texto(texto, diccionario):
-    diccionario.actualizar_frecuencias(texto)
+    # Una sola pasada de tokenización; cada palabra distinta se busca en el
+    # diccionario una vez y el reemplazo de todas las apariciones se hace con
+    # map sobre la lista de partes
+    partes = tokenizar(texto)
+    palabras = partes[1::2]
+    diccionario.contar_palabras(palabras)
     diccionario.optimizar_diccionario()
 
-    resultado = []
-    palabra_actual = ""
-    for caracter in texto:
-        if caracter.isalnum() or caracter == "'":
-            palabra_actual += caracter
+    codigos = diccionario.palabra_a_codigo
+    reemplazos = {}
+    for palabra in set(palabras):
+        codigo = codigos.get(palabra.lower())
+        if codigo is None:
+            reemplazos[palabra] = palabra
+        elif palabra[0].isupper():
+            reemplazos[palabra] = codigo + "^"  # Indicador para mayúscula
         else:
-            if palabra_actual:
-                if palabra_actual.lower() in diccionario.palabra_a_codigo:
-                    codigo = diccionario.obtener_codigo(palabra_actual.lower())
-                    if palabra_actual[0].isupper():
-                        resultado.append(f"{codigo}^")  # Indicador para mayúscula
-                    else:
-                        resultado.append(codigo)
-                else:
-                    resultado.append(palabra_actual)
-                palabra_actual = ""
-            resultado.append(caracter)
-    if palabra_actual:
-        if palabra_actual.lower() in diccionario.palabra_a_codigo:
-            codigo = diccionario.obtener_codigo(palabra_actual.lower())
-            if palabra_actual[0].isupper():
-                resultado.append(f"{codigo}^")
-            else:
-                resultado.append(codigo)
-        else:
-            resultado.append(palabra_actual)
-    return "".join(resultado)
+            reemplazos[palabra] = codigo
+    partes[1::2] = map(reemplazos.__getitem__, palabras)
+    return "".join(partes)
 
 def descomprimir_texto(texto_comprimido, diccionario):
-    resultado = []
-    numero = ""
-    mayuscula = False
-    for caracter in texto_comprimido:
-        if caracter.isdigit():
-            numero += caracter
-        elif caracter == "^":
-            mayuscula = True
-        else:
-            if numero:
-                palabra = diccionario.obtener_palabra(numero)
-                if mayuscula:
-                    palabra = palabra.capitalize()
-                    mayuscula = False
-                resultado.append(palabra)
-                numero = ""
-            resultado.append(caracter)
-    if numero:
-        palabra = diccionario.obtener_palabra(numero)
-        if mayuscula:
-            palabra = palabra.capitalize()
-        resultado.append(palabra)
-    return "".join(resultado)
+    partes = PATRON_CODIGO.split(texto_comprimido)
+    codigos = partes[1::2]
+    reemplazos = {}
+    for codigo in set(codigos):
+        palabra = diccionario.obtener_palabra(codigo.rstrip("^"))
+        reemplazos[codigo] = palabra.capitalize() if codigo.endswith("^") else palabra
+    partes[1::2] = map(reemplazos.__getitem__, codigos)
+    return "".join(partes)
 
 def calcular_tamano(texto):
     return len(texto.encode('utf-8'))
@@ -0,0 +1,197 @@
+import argparse
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from binario import codificar_partes, decodificar_partes
+from flujo import escribir_diccionario, leer_diccionario
+from main import Diccionario, tokenizar
+
+# Contenedor indexado:
+#   MAGIA_INDICE, el diccionario (como en flujo.py) y los bloques en el
+#   formato de binario.py uno detrás de otro; después el índice, con
+#   BYTES_ENTERO bytes por número: cantidad de bloques y, por cada bloque, su
+#   posición, su tamaño comprimido y su tamaño original. Al final, la posición
+#   del índice y MAGIA_INDICE otra vez. Con el índice cualquier bloque se
+#   puede leer sin recorrer los anteriores.
+MAGIA_INDICE = b"DICI\x01"
+BYTES_ENTERO = 8
+TAMANO_BLOQUE = 4 << 20
+TAREAS_POR_PROCESO = 2
+
+# Los bloques se cortan en un espacio en blanco ASCII: nunca está dentro de
+# una palabra ni de un carácter UTF-8 de varios bytes
+PATRON_BLANCO = re.compile(rb"\s")
+LECTURA_BUSQUEDA = 1 << 16
+
+# Archivo y diccionario de cada proceso de trabajo, como _buscador en lote.py
+_ruta = None
+_codigos = None
+
+
+def _iniciar_trabajador(ruta, codigos):
+    global _ruta, _codigos
+    _ruta = ruta
+    _codigos = codigos
+
+
+def _leer_rango(inicio, fin):
+    with open(_ruta, 'rb') as archivo:
+        archivo.seek(inicio)
+        return archivo.read(fin - inicio).decode('utf-8')
+
+
+def _contar_bloque(rango):
+    contador = Diccionario()
+    contador.contar_palabras(tokenizar(_leer_rango(*rango))[1::2])
+    return contador.frecuencias
+
+
+def _comprimir_bloque(rango):
+    return codificar_partes(tokenizar(_leer_rango(*rango)), _codigos)
+
+
+def _descomprimir_bloque(bloque):
+    posicion, tamano = bloque
+    with open(_ruta, 'rb') as archivo:
+        archivo.seek(posicion)
+        texto, _ = decodificar_partes(archivo.read(tamano), _codigos)
+    return texto.encode('utf-8')
+
+
+def limites_bloques(ruta, tamano_bloque=TAMANO_BLOQUE):
+    # Rangos [inicio, fin) de aproximadamente tamano_bloque bytes; cada corte
+    # se corre hasta el siguiente espacio en blanco
+    total = os.path.getsize(ruta)
+    rangos = []
+    inicio = 0
+    with open(ruta, 'rb') as archivo:
+        while inicio < total:
+            fin = min(total, inicio + tamano_bloque)
+            archivo.seek(fin)
+            while fin < total:
+                datos = archivo.read(LECTURA_BUSQUEDA)
+                blanco = PATRON_BLANCO.search(datos)
+                if blanco:
+                    fin += blanco.start()
+                    break
+                fin += len(datos)
+            rangos.append((inicio, fin))
+            inicio = fin
+    return rangos
+
+
+def _crear_ejecutor(procesos, ruta, codigos):
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context('fork' if 'fork' in metodos else None)
+    return ProcessPoolExecutor(procesos, mp_context=contexto, initializer=_iniciar_trabajador,
+                               initargs=(ruta, codigos))
+
+
+def _en_orden(ejecutor, funcion, argumentos, procesos):
+    # Como ejecutor.map, pero con a lo sumo TAREAS_POR_PROCESO tareas
+    # pendientes por proceso: los resultados no se acumulan en memoria si
+    # escribirlos es más lento que calcularlos
+    pendientes = deque()
+    for argumento in argumentos:
+        if len(pendientes) >= procesos * TAREAS_POR_PROCESO:
+            yield pendientes.popleft().result()
+        pendientes.append(ejecutor.submit(funcion, argumento))
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def _escribir_entero(salida, numero):
+    salida.write(numero.to_bytes(BYTES_ENTERO, 'little'))
+
+
+def comprimir_paralelo(ruta_entrada, ruta_salida, procesos=None, tamano_bloque=TAMANO_BLOQUE):
+    # Primera pasada: cada proceso cuenta las palabras de sus bloques y los
+    # Counter se suman en un diccionario global. Segunda pasada: cada bloque
+    # se comprime por separado con ese diccionario.
+    procesos = procesos or os.cpu_count() or 1
+    rangos = limites_bloques(ruta_entrada, tamano_bloque)
+
+    diccionario = Diccionario()
+    with _crear_ejecutor(procesos, ruta_entrada, None) as ejecutor:
+        for frecuencias in ejecutor.map(_contar_bloque, rangos):
+            diccionario.frecuencias.update(frecuencias)
+    diccionario.optimizar_diccionario()
+
+    indice = []
+    with open(ruta_salida, 'wb') as salida, \
+            _crear_ejecutor(procesos, ruta_entrada, diccionario.palabra_a_codigo) as ejecutor:
+        salida.write(MAGIA_INDICE)
+        escribir_diccionario(salida, diccionario.codigo_a_palabra)
+        for (inicio, fin), bloque in zip(rangos, _en_orden(ejecutor, _comprimir_bloque, rangos, procesos)):
+            indice.append((salida.tell(), len(bloque), fin - inicio))
+            salida.write(bloque)
+
+        posicion_indice = salida.tell()
+        _escribir_entero(salida, len(indice))
+        for entrada in indice:
+            for numero in entrada:
+                _escribir_entero(salida, numero)
+        _escribir_entero(salida, posicion_indice)
+        salida.write(MAGIA_INDICE)
+    return diccionario
+
+
+def leer_indice(ruta):
+    # Retorna el diccionario y la lista de (posición, tamaño comprimido,
+    # tamaño original) de cada bloque
+    with open(ruta, 'rb') as archivo:
+        if archivo.read(len(MAGIA_INDICE)) != MAGIA_INDICE:
+            raise ValueError("El archivo no tiene el formato del compresor paralelo")
+        codigo_a_palabra = leer_diccionario(archivo)
+
+        archivo.seek(-(BYTES_ENTERO + len(MAGIA_INDICE)), os.SEEK_END)
+        posicion_indice = int.from_bytes(archivo.read(BYTES_ENTERO), 'little')
+        if archivo.read() != MAGIA_INDICE:
+            raise ValueError("El archivo comprimido está truncado")
+        archivo.seek(posicion_indice)
+        cantidad = int.from_bytes(archivo.read(BYTES_ENTERO), 'little')
+        numeros = archivo.read(3 * BYTES_ENTERO * cantidad)
+    numeros = [int.from_bytes(numeros[i:i + BYTES_ENTERO], 'little')
+               for i in range(0, len(numeros), BYTES_ENTERO)]
+    return codigo_a_palabra, list(zip(numeros[0::3], numeros[1::3], numeros[2::3]))
+
+
+def descomprimir_bloque(ruta, numero, indice=None):
+    # Acceso aleatorio: solo se leen la cabecera, el índice y el bloque pedido
+    codigo_a_palabra, bloques = indice or leer_indice(ruta)
+    posicion, tamano, _ = bloques[numero]
+    with open(ruta, 'rb') as archivo:
+        archivo.seek(posicion)
+        texto, _ = decodificar_partes(archivo.read(tamano), codigo_a_palabra)
+    return texto
+
+
+def descomprimir_paralelo(ruta_entrada, ruta_salida, procesos=None):
+    procesos = procesos or os.cpu_count() or 1
+    codigo_a_palabra, bloques = leer_indice(ruta_entrada)
+    with open(ruta_salida, 'wb') as salida, \
+            _crear_ejecutor(procesos, ruta_entrada, codigo_a_palabra) as ejecutor:
+        for texto in _en_orden(ejecutor, _descomprimir_bloque,
+                               [(posicion, tamano) for posicion, tamano, _ in bloques], procesos):
+            salida.write(texto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprime o descomprime archivos de texto por bloques en paralelo.")
+    parser.add_argument('accion', choices=['comprimir', 'descomprimir'])
+    parser.add_argument('entrada')
+    parser.add_argument('salida')
+    parser.add_argument('-p', '--procesos', type=int, default=None)
+    parser.add_argument('--bloque', type=int, default=TAMANO_BLOQUE, help="tamaño de bloque en bytes")
+    argumentos = parser.parse_args()
+    if argumentos.accion == 'comprimir':
+        comprimir_paralelo(argumentos.entrada, argumentos.salida, argumentos.procesos, argumentos.bloque)
+    else:
+        descomprimir_paralelo(argumentos.entrada, argumentos.salida, argumentos.procesos)
+
+
+if __name__ == "__main__":
+    main()
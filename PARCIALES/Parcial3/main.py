@@ -1,3 +1,7 @@
+import heapq
+
+import numpy as np
+
 datos = [
     ['Medellín', 24, 1495, 'Turismo urbano, visitas a museos y parques, recorridos gastronómicos, entre otros.', 0, 33, 83, 18, 13],
     ['Guatapé', 24, 2135, 'Visitar la Piedra del Peñol, paseos en bote por el embalse, disfrutar de la gastronomía local, entre otros.', 79, 43, 144, 71, 53],
@@ -25,19 +29,172 @@ def calcular_similitud(m1, m2):
     similitud = diferencia_altura + diferencia_distancias
     return similitud
 
-municipio_usuario = input("Ingrese el nombre de un municipio que le haya gustado: ")
+# Columnas de cada municipio que se comparan: la altura y las cinco distancias
+COLUMNAS_CARACTERISTICAS = [2, 4, 5, 6, 7, 8]
+# Desde cuántos municipios conviene buscar con el árbol k-d en lugar de
+# comparar contra todos
+MIN_MUNICIPIOS_ARBOL = 10000
+TAMANO_HOJA = 64
 
-municipio_preferido = encontrar_municipio(municipio_usuario, datos)
 
-if municipio_preferido is None:
-    print("Lo siento, el municipio ingresado no se encuentra en la base de datos.")
-else:
-    similitudes = []
-    for municipio in datos:
-        if municipio[0].lower() != municipio_preferido[0].lower():
-            similitud = calcular_similitud(municipio_preferido, municipio)
-            similitudes.append((similitud, municipio))
-    similitudes.sort(key=lambda x: x[0])
-    municipio_recomendado = similitudes[0][1]
-    print("\nBasado en su preferencia por {}, le recomendamos visitar {}.".format(municipio_preferido[0], municipio_recomendado[0]))
-    print("Actividades en {}: {}".format(municipio_recomendado[0], municipio_recomendado[3]))
\ No newline at end of file
+class ArbolKD:
+    # Árbol k-d guardado en listas paralelas (un elemento por nodo). Cada nodo
+    # interno divide sus puntos por la mediana de la dimensión con mayor
+    # rango; las hojas guardan hasta tamano_hoja puntos contiguos de
+    # self.puntos, que se comparan con una sola operación de NumPy.
+
+    def __init__(self, puntos, tamano_hoja=TAMANO_HOJA):
+        orden = np.arange(len(puntos))
+        self.dimension = []   # -1 en las hojas
+        self.corte = []
+        self.hijos = []       # (izquierdo, derecho) en los nodos internos
+        self.rango = []       # (inicio, fin) en self.puntos
+        pendientes = [(0, len(puntos), self._nuevo_nodo())]
+        while pendientes:
+            inicio, fin, nodo = pendientes.pop()
+            self.rango[nodo] = (inicio, fin)
+            if fin - inicio <= tamano_hoja:
+                continue
+            subconjunto = orden[inicio:fin]
+            valores = puntos[subconjunto]
+            dimension = int(np.argmax(valores.max(axis=0) - valores.min(axis=0)))
+            medio = (fin - inicio) // 2
+            particion = np.argpartition(valores[:, dimension], medio)
+            orden[inicio:fin] = subconjunto[particion]
+            izquierdo, derecho = self._nuevo_nodo(), self._nuevo_nodo()
+            self.dimension[nodo] = dimension
+            self.corte[nodo] = float(puntos[orden[inicio + medio], dimension])
+            self.hijos[nodo] = (izquierdo, derecho)
+            pendientes.append((inicio, inicio + medio, izquierdo))
+            pendientes.append((inicio + medio, fin, derecho))
+        self.orden = orden
+        self.puntos = puntos[orden]
+
+    def _nuevo_nodo(self):
+        self.dimension.append(-1)
+        self.corte.append(0.0)
+        self.hijos.append(None)
+        self.rango.append(None)
+        return len(self.dimension) - 1
+
+    def vecinos(self, consulta, k=1, excluir=None):
+        # Los k puntos más cercanos a consulta en distancia L1, como lista de
+        # (distancia, índice original) ordenada; los empates se resuelven por
+        # índice, igual que la búsqueda exhaustiva. Se recorre primero el hijo
+        # del lado de la consulta y se descarta un nodo si la distancia L1 a
+        # su región ya supera la del k-ésimo mejor.
+        mejores = []  # heap de (-distancia, -índice): el peor queda arriba
+        pendientes = [(0.0, 0, np.zeros(len(consulta)))]
+        while pendientes:
+            cota, nodo, desvios = pendientes.pop()
+            if len(mejores) == k and cota > -mejores[0][0]:
+                continue
+            dimension = self.dimension[nodo]
+            if dimension < 0:
+                inicio, fin = self.rango[nodo]
+                distancias = np.abs(self.puntos[inicio:fin] - consulta).sum(axis=1)
+                if len(mejores) == k:
+                    candidatos = np.flatnonzero(distancias <= -mejores[0][0])
+                else:
+                    candidatos = range(fin - inicio)
+                for i in candidatos:
+                    indice = int(self.orden[inicio + i])
+                    if indice == excluir:
+                        continue
+                    elemento = (-float(distancias[i]), -indice)
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, elemento)
+                    elif elemento > mejores[0]:
+                        heapq.heapreplace(mejores, elemento)
+                continue
+
+            diferencia = consulta[dimension] - self.corte[nodo]
+            izquierdo, derecho = self.hijos[nodo]
+            cercano, lejano = (izquierdo, derecho) if diferencia < 0 else (derecho, izquierdo)
+            # El hijo lejano está al menos a |diferencia| en esta dimensión
+            desvios_lejano = desvios.copy()
+            desvios_lejano[dimension] = abs(diferencia)
+            pendientes.append((cota - desvios[dimension] + abs(diferencia), lejano, desvios_lejano))
+            pendientes.append((cota, cercano, desvios))
+        return sorted((-distancia, -indice) for distancia, indice in mejores)
+
+
+class MotorRecomendaciones:
+    # Recomendador sobre una matriz de características (una fila por
+    # municipio). La distancia entre dos municipios es la suma ponderada de
+    # las diferencias absolutas de sus características; con los pesos por
+    # defecto y sin normalizar es la misma que calcular_similitud.
+
+    def __init__(self, datos, pesos=None, normalizar=False, usar_arbol=None):
+        self.datos = datos
+        # Índice de nombres en minúsculas; con nombres repetidos gana el
+        # primero, como en encontrar_municipio
+        self.indice_nombres = {}
+        for i, municipio in enumerate(datos):
+            self.indice_nombres.setdefault(municipio[0].lower(), i)
+
+        caracteristicas = np.array([[municipio[columna] for columna in COLUMNAS_CARACTERISTICAS]
+                                    for municipio in datos], dtype=float).reshape(len(datos), len(COLUMNAS_CARACTERISTICAS))
+        factores = np.ones(len(COLUMNAS_CARACTERISTICAS)) if pesos is None else np.asarray(pesos, dtype=float)
+        if normalizar and len(datos):
+            # Cada característica se divide por su rango, así la altura (miles
+            # de metros) no pesa más que las distancias (decenas de km)
+            rangos = caracteristicas.max(axis=0) - caracteristicas.min(axis=0)
+            factores = factores / np.where(rangos > 0, rangos, 1)
+        # Escalar cada columna por su factor convierte la distancia ponderada
+        # en una distancia L1 común, que es la que usa el árbol
+        self.puntos = caracteristicas * factores
+
+        if usar_arbol is None:
+            usar_arbol = len(datos) >= MIN_MUNICIPIOS_ARBOL
+        self.arbol = ArbolKD(self.puntos) if usar_arbol else None
+
+    def encontrar(self, nombre):
+        indice = self.indice_nombres.get(nombre.lower())
+        return None if indice is None else self.datos[indice]
+
+    def vecinos(self, indice, k=1):
+        # Los k municipios más parecidos al de la fila indice (sin incluirlo),
+        # como lista de (distancia, índice) de menor a mayor distancia
+        if self.arbol is not None:
+            return self.arbol.vecinos(self.puntos[indice], k, excluir=indice)
+        distancias = np.abs(self.puntos - self.puntos[indice]).sum(axis=1)
+        distancias[indice] = np.inf
+        k = min(k, len(distancias) - 1)
+        if k <= 0:
+            return []
+        # argpartition encuentra el k-ésimo valor sin ordenar todo; se toman
+        # todos los empatados con él para que gane el de menor índice
+        umbral = np.partition(distancias, k - 1)[k - 1]
+        candidatos = np.flatnonzero(distancias <= umbral)
+        candidatos = candidatos[np.lexsort((candidatos, distancias[candidatos]))][:k]
+        return [(float(distancias[i]), int(i)) for i in candidatos]
+
+    def recomendar(self, nombre, k=1):
+        # Lista de (distancia, municipio) con los k más parecidos, o None si el
+        # municipio no está en los datos
+        indice = self.indice_nombres.get(nombre.lower())
+        if indice is None:
+            return None
+        return [(distancia, self.datos[i]) for distancia, i in self.vecinos(indice, k)]
+
+
+def main():
+    motor = MotorRecomendaciones(datos)
+    municipio_usuario = input("Ingrese el nombre de un municipio que le haya gustado: ")
+
+    recomendaciones = motor.recomendar(municipio_usuario)
+
+    if recomendaciones is None:
+        print("Lo siento, el municipio ingresado no se encuentra en la base de datos.")
+    elif not recomendaciones:
+        print("No hay otros municipios para recomendar.")
+    else:
+        municipio_preferido = motor.encontrar(municipio_usuario)
+        municipio_recomendado = recomendaciones[0][1]
+        print("\nBasado en su preferencia por {}, le recomendamos visitar {}.".format(municipio_preferido[0], municipio_recomendado[0]))
+        print("Actividades en {}: {}".format(municipio_recomendado[0], municipio_recomendado[3]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import csv
+import itertools
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from main import BuscadorRutas, MAX_RUTAS_MOSTRADAS
+
+
+def generar_red(n_aeropuertos, conexiones_por_aeropuerto=6, semilla=42):
+    # Red sintética: cada aeropuerto tiene vuelos a varios destinos aleatorios
+    # y el costo crece con la duración del tramo
+    aleatorio = random.Random(semilla)
+    ciudades = [f"Ciudad{i:06d}" for i in range(n_aeropuertos)]
+    filas = []
+    for i, origen in enumerate(ciudades):
+        # Un anillo garantiza que la red sea fuertemente conexa
+        destinos = {ciudades[(i + 1) % n_aeropuertos]}
+        while len(destinos) < min(conexiones_por_aeropuerto, n_aeropuertos - 1):
+            destino = aleatorio.choice(ciudades)
+            if destino != origen:
+                destinos.add(destino)
+        for destino in sorted(destinos):
+            duracion = round(aleatorio.uniform(0.5, 12.0), 1)
+            costo = round(40 + duracion * aleatorio.uniform(30, 80), 2)
+            filas.append((origen, destino, costo, duracion))
+    return ciudades, filas
+
+
+def escribir_csv(filas, nombre_archivo):
+    with open(nombre_archivo, 'w', encoding='utf-8', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['origen', 'destino', 'costo', 'duracion'])
+        escritor.writerows(filas)
+
+
+def cronometrar(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def comparar_motores(buscador, consultas, max_escalas):
+    tiempo_enumerador = 0.0
+    tiempo_best_first = 0.0
+    for origen, destino in consultas:
+        rutas, segundos = cronometrar(
+            buscador.encontrar_todas_las_rutas, origen, destino, max_escalas=max_escalas)
+        esperadas = sorted(rutas, key=lambda x: x['costo'])[:MAX_RUTAS_MOSTRADAS]
+        tiempo_enumerador += segundos
+
+        rutas, segundos = cronometrar(
+            lambda: list(itertools.islice(
+                buscador.rutas_mas_baratas(origen, destino, max_escalas=max_escalas),
+                MAX_RUTAS_MOSTRADAS)))
+        tiempo_best_first += segundos
+
+        costos_esperados = [round(r['costo'], 6) for r in esperadas]
+        costos_obtenidos = [round(r['costo'], 6) for r in rutas]
+        if costos_esperados != costos_obtenidos:
+            raise AssertionError(f"Resultados distintos para {origen} → {destino}")
+    return tiempo_enumerador, tiempo_best_first
+
+
+def benchmark_rutas(tamanos):
+    tamanos = tamanos or [1000, 5000]
+    consultas_por_tamano = 5
+
+    with tempfile.TemporaryDirectory() as directorio:
+        directorio = Path(directorio)
+        print(f"{'Aeropuertos':>12} {'Escalas':>8} {'Enumerador (s)':>15} {'Best-first (s)':>15}")
+        for n in tamanos:
+            ciudades, filas = generar_red(n)
+            archivo_rutas = directorio / f"red_{n}.csv"
+            escribir_csv(filas, archivo_rutas)
+            buscador = BuscadorRutas(archivo_rutas, directorio / "historial.jsonl")
+
+            aleatorio = random.Random(n)
+            consultas = [tuple(aleatorio.sample(ciudades, 2)) for _ in range(consultas_por_tamano)]
+            for max_escalas in (2, 3, 4, 5):
+                enumerador, best_first = comparar_motores(buscador, consultas, max_escalas)
+                print(f"{n:>12} {max_escalas:>8} {enumerador:>15.4f} {best_first:>15.4f}")
+
+            # Sin límite de escalas el enumerador es inviable; solo se mide el nuevo motor
+            _, segundos = cronometrar(lambda: [
+                list(itertools.islice(buscador.rutas_mas_baratas(o, d), MAX_RUTAS_MOSTRADAS))
+                for o, d in consultas])
+            print(f"{n:>12} {'∞':>8} {'-':>15} {segundos:>15.4f}")
+
+            _, segundos = cronometrar(lambda: [buscador.rutas_pareto(o, d) for o, d in consultas])
+            print(f"{n:>12} {'Pareto':>8} {'-':>15} {segundos:>15.4f}")
+
+
+def recorrer_tramos(buscador, ciudades):
+    total = 0.0
+    for ciudad in ciudades:
+        for _, costo, _ in buscador._conexiones(ciudad):
+            total += costo
+    return total
+
+
+def benchmark_memoria(tamanos):
+    tamanos = tamanos or [10000, 100000]
+    conexiones_por_aeropuerto = 10
+
+    with tempfile.TemporaryDirectory() as directorio:
+        directorio = Path(directorio)
+        print(f"{'Tramos':>10} {'Formato':>12} {'Memoria (MB)':>13} {'Carga (s)':>10} "
+              f"{'Recorrido (s)':>14} {'Búsquedas (s)':>14}")
+        for n in tamanos:
+            ciudades, filas = generar_red(n, conexiones_por_aeropuerto)
+            archivo_rutas = directorio / f"red_{n}.csv"
+            escribir_csv(filas, archivo_rutas)
+            del filas
+            aleatorio = random.Random(n)
+            consultas = [tuple(aleatorio.sample(ciudades, 2)) for _ in range(5)]
+
+            for compacto in (False, True):
+                tracemalloc.start()
+                buscador, carga = cronometrar(
+                    BuscadorRutas, archivo_rutas, directorio / "historial.jsonl", compacto=compacto)
+                memoria = tracemalloc.get_traced_memory()[0] / 2**20
+                tracemalloc.stop()
+
+                _, recorrido = cronometrar(recorrer_tramos, buscador, ciudades)
+                _, busquedas = cronometrar(lambda: [
+                    list(itertools.islice(buscador.rutas_mas_baratas(o, d), MAX_RUTAS_MOSTRADAS))
+                    for o, d in consultas])
+                formato = "CSR" if compacto else "dict"
+                print(f"{n * conexiones_por_aeropuerto:>10} {formato:>12} {memoria:>13.1f} "
+                      f"{carga:>10.3f} {recorrido:>14.4f} {busquedas:>14.4f}")
+                del buscador
+
+
+def benchmark_carga(tamanos):
+    tamanos = tamanos or [10000, 100000]
+    conexiones_por_aeropuerto = 10
+
+    with tempfile.TemporaryDirectory() as directorio:
+        directorio = Path(directorio)
+        print(f"{'Tramos':>10} {'dict (s)':>10} {'CSR frío (s)':>13} {'Instantánea (s)':>16}")
+        for n in tamanos:
+            _, filas = generar_red(n, conexiones_por_aeropuerto)
+            archivo_rutas = directorio / f"red_{n}.csv"
+            escribir_csv(filas, archivo_rutas)
+            del filas
+            historial = directorio / "historial.jsonl"
+
+            _, diccionario = cronometrar(BuscadorRutas, archivo_rutas, historial)
+            # La primera carga compacta parsea el CSV y escribe la instantánea;
+            # la segunda solo mapea el archivo binario
+            _, frio = cronometrar(BuscadorRutas, archivo_rutas, historial, compacto=True)
+            _, instantanea = cronometrar(BuscadorRutas, archivo_rutas, historial, compacto=True)
+            print(f"{n * conexiones_por_aeropuerto:>10} {diccionario:>10.3f} {frio:>13.3f} "
+                  f"{instantanea:>16.4f}")
+
+
+def benchmark_indice(tamanos):
+    tamanos = tamanos or [500, 2000]
+    consultas_por_tamano = 50
+
+    with tempfile.TemporaryDirectory() as directorio:
+        directorio = Path(directorio)
+        print(f"{'Aeropuertos':>12} {'Construcción (s)':>17} {'Consulta':>10} "
+              f"{'Sin índice (ms)':>16} {'Con índice (ms)':>16}")
+        for n in tamanos:
+            ciudades, filas = generar_red(n)
+            archivo_rutas = directorio / f"red_{n}.csv"
+            escribir_csv(filas, archivo_rutas)
+            historial = directorio / "historial.jsonl"
+            sin_indice = BuscadorRutas(archivo_rutas, historial)
+            con_indice, construccion = cronometrar(BuscadorRutas, archivo_rutas, historial,
+                                                   indexar=True)
+
+            aleatorio = random.Random(n)
+            pares = [tuple(aleatorio.sample(ciudades, 2)) for _ in range(consultas_por_tamano)]
+            # Un precio máximo de 30 USD está por debajo de cualquier tramo: la
+            # consulta es imposible
+            for nombre, max_precio, max_escalas in (('imposible', 30.0, float('inf')),
+                                                    ('directa', float('inf'), 0),
+                                                    ('libre', float('inf'), float('inf'))):
+                tiempos = []
+                for buscador in (sin_indice, con_indice):
+                    _, segundos = cronometrar(lambda: [
+                        list(itertools.islice(
+                            buscador.rutas_mas_baratas(o, d, max_precio, max_escalas),
+                            MAX_RUTAS_MOSTRADAS))
+                        for o, d in pares])
+                    tiempos.append(segundos * 1000 / len(pares))
+                print(f"{n:>12} {construccion:>17.2f} {nombre:>10} "
+                      f"{tiempos[0]:>16.3f} {tiempos[1]:>16.3f}")
+
+
+BENCHMARKS = {'rutas': benchmark_rutas, 'memoria': benchmark_memoria, 'carga': benchmark_carga,
+              'indice': benchmark_indice}
+
+
+def main():
+    argumentos = sys.argv[1:]
+    modo = argumentos.pop(0) if argumentos and argumentos[0] in BENCHMARKS else 'rutas'
+    BENCHMARKS[modo]([int(n) for n in argumentos])
+
+
+if __name__ == "__main__":
+    main()
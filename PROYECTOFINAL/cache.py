@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+
+TAMANO_CACHE = 256
+TTL_CACHE = 600.0
+
+
+class CacheConsultas:
+    # Cache LRU con expiración para resultados de búsqueda. Cada entrada guarda
+    # los límites con los que se calculó, así una consulta más restrictiva se
+    # puede responder filtrando el resultado de una menos restrictiva.
+
+    def __init__(self, tamano_maximo=TAMANO_CACHE, ttl=TTL_CACHE):
+        self.tamano_maximo = tamano_maximo
+        self.ttl = ttl
+        self.entradas = OrderedDict()
+        self.por_ruta = {}
+        self.aciertos = 0
+        self.fallos = 0
+
+    def invalidar(self):
+        self.entradas.clear()
+        self.por_ruta.clear()
+
+    def _expirada(self, entrada):
+        return time.monotonic() - entrada['creada'] > self.ttl
+
+    def _eliminar(self, clave):
+        del self.entradas[clave]
+        claves = self.por_ruta[clave[:3]]
+        claves.discard(clave)
+        if not claves:
+            del self.por_ruta[clave[:3]]
+
+    def obtener(self, tipo, origen, destino, max_precio, max_escalas, k=None):
+        clave = (tipo, origen, destino, max_precio, max_escalas, k)
+        candidatas = [clave] if clave in self.entradas else []
+        candidatas.extend(self.por_ruta.get(clave[:3], ()))
+
+        for candidata in candidatas:
+            entrada = self.entradas.get(candidata)
+            if entrada is None:
+                continue
+            if self._expirada(entrada):
+                self._eliminar(candidata)
+                continue
+            resultado = filtrar_entrada(entrada, max_precio, max_escalas, k)
+            if resultado is not None:
+                self.entradas.move_to_end(candidata)
+                self.aciertos += 1
+                return resultado
+
+        self.fallos += 1
+        return None
+
+    def guardar(self, tipo, origen, destino, max_precio, max_escalas, resultado, k=None):
+        clave = (tipo, origen, destino, max_precio, max_escalas, k)
+        if clave in self.entradas:
+            self._eliminar(clave)
+        self.entradas[clave] = {
+            'max_precio': max_precio,
+            'max_escalas': max_escalas,
+            'k': k,
+            # Una lista con menos de k rutas contiene todas las que existen
+            'completo': k is None or len(resultado) < k,
+            'resultado': resultado,
+            'creada': time.monotonic()
+        }
+        self.por_ruta.setdefault(clave[:3], set()).add(clave)
+        while len(self.entradas) > self.tamano_maximo:
+            self._eliminar(next(iter(self.entradas)))
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'entradas': len(self.entradas),
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0
+        }
+
+
+def filtrar_entrada(entrada, max_precio, max_escalas, k):
+    # Las rutas guardadas están ordenadas por costo. Con el mismo límite de
+    # escalas, las rutas más baratas bajo un precio menor son un prefijo de la
+    # lista guardada. Con menos escalas solo sirve una lista completa. Un
+    # conjunto completo (como la frontera de Pareto) siempre se puede filtrar.
+    if entrada['max_precio'] < max_precio or entrada['max_escalas'] < max_escalas:
+        return None
+    if not entrada['completo']:
+        if entrada['max_escalas'] != max_escalas or (k is None or k > entrada['k']):
+            return None
+
+    rutas = [ruta for ruta in entrada['resultado']
+             if ruta['costo'] <= max_precio and len(ruta['camino']) - 2 <= max_escalas]
+    return rutas[:k] if k is not None else rutas
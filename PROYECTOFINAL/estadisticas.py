@@ -0,0 +1,95 @@
+import math
+
+PRECISION_RELATIVA = 0.01
+TOP_RUTAS = 5
+
+
+class ResumenMetrica:
+    # Agregados que se actualizan en O(1) por valor: cantidad, suma, mínimo,
+    # máximo y un histograma logarítmico para estimar percentiles con error
+    # relativo menor a PRECISION_RELATIVA. El histograma tiene un número de
+    # cubetas acotado por el rango de valores, no por la cantidad de búsquedas.
+
+    def __init__(self, precision=PRECISION_RELATIVA):
+        self.gamma = (1 + precision) / (1 - precision)
+        self.log_gamma = math.log(self.gamma)
+        self.cantidad = 0
+        self.suma = 0.0
+        self.minimo = None
+        self.maximo = None
+        # Los valores <= 0 no tienen logaritmo y se cuentan aparte; la cubeta 0
+        # es la de los valores en (1 / gamma, 1]
+        self.ceros = 0
+        self.cubetas = {}
+
+    def agregar(self, valor):
+        self.cantidad += 1
+        self.suma += valor
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+        if valor <= 0:
+            self.ceros += 1
+            return
+        cubeta = math.ceil(math.log(valor) / self.log_gamma)
+        self.cubetas[cubeta] = self.cubetas.get(cubeta, 0) + 1
+
+    def promedio(self):
+        return self.suma / self.cantidad if self.cantidad else 0.0
+
+    def percentil(self, p):
+        if not self.cantidad:
+            return None
+        # El estimado siempre queda entre el mínimo y el máximo observados
+        objetivo = p / 100 * (self.cantidad - 1)
+        acumulado = self.ceros
+        if acumulado > objetivo:
+            return min(max(0.0, self.minimo), self.maximo)
+        for cubeta in sorted(self.cubetas):
+            acumulado += self.cubetas[cubeta]
+            if acumulado > objetivo:
+                estimado = 2 * self.gamma ** cubeta / (self.gamma + 1)
+                return min(max(estimado, self.minimo), self.maximo)
+        return self.maximo
+
+    def a_dict(self):
+        return {'cantidad': self.cantidad, 'suma': self.suma, 'minimo': self.minimo,
+                'maximo': self.maximo, 'ceros': self.ceros, 'cubetas': self.cubetas}
+
+    @classmethod
+    def desde_dict(cls, data):
+        resumen = cls()
+        resumen.cantidad = data['cantidad']
+        resumen.suma = data['suma']
+        resumen.minimo = data['minimo']
+        resumen.maximo = data['maximo']
+        resumen.ceros = data.get('ceros', 0)
+        resumen.cubetas = {int(cubeta): cantidad for cubeta, cantidad in data['cubetas'].items()}
+        return resumen
+
+
+class TopRutas:
+    # Las N rutas más buscadas, mantenidas a medida que el contador crece de a
+    # uno: solo la ruta incrementada puede entrar al top o cambiar de puesto
+
+    def __init__(self, n=TOP_RUTAS):
+        self.n = n
+        self.rutas = []
+
+    def reconstruir(self, contador):
+        self.rutas = [ruta for ruta, _ in contador.most_common(self.n)]
+
+    def incrementar(self, ruta, contador):
+        if ruta not in self.rutas:
+            if len(self.rutas) < self.n:
+                self.rutas.append(ruta)
+            elif contador[ruta] > contador[self.rutas[-1]]:
+                self.rutas[-1] = ruta
+            else:
+                return
+        i = self.rutas.index(ruta)
+        while i > 0 and contador[self.rutas[i - 1]] < contador[ruta]:
+            self.rutas[i - 1], self.rutas[i] = self.rutas[i], self.rutas[i - 1]
+            i -= 1
+
+    def mas_buscadas(self, contador):
+        return [(ruta, contador[ruta]) for ruta in self.rutas]
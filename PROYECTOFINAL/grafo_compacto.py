@@ -0,0 +1,214 @@
+import csv
+import hashlib
+import itertools
+import mmap
+import os
+import struct
+from array import array
+from collections import Counter
+
+TAMANO_BLOQUE = 65536
+MAGIA_INSTANTANEA = b'GRAFOCSR'
+VERSION_INSTANTANEA = 1
+# magia, versión, mtime_ns y tamaño del CSV, sha256 del CSV, ciudades, tramos,
+# bytes de nombres
+CABECERA = struct.Struct('<8sqqq32sqqq')
+
+
+class GrafoCompacto:
+    # Grafo en formato CSR: los tramos que salen de la ciudad i ocupan las
+    # posiciones desplazamientos[i]:desplazamientos[i + 1] de los arreglos
+    # destinos, costos y duraciones. Las ciudades se guardan como enteros.
+
+    def __init__(self, ciudades, desplazamientos, destinos, costos, duraciones, ids=None):
+        self.ciudades = ciudades
+        self.ids = ids if ids is not None else {ciudad: i for i, ciudad in enumerate(ciudades)}
+        self.desplazamientos = desplazamientos
+        self.destinos = destinos
+        self.costos = costos
+        self.duraciones = duraciones
+
+    @classmethod
+    def desde_filas(cls, filas, tamano_bloque=TAMANO_BLOQUE):
+        # Las filas se procesan por bloques: cada bloque se convierte con
+        # comprensiones y se vuelca de una vez en los arreglos
+        filas = iter(filas)
+        ciudades = []
+        ids = {}
+        origenes = array('q')
+        destinos = array('q')
+        costos = array('d')
+        duraciones = array('d')
+
+        while True:
+            bloque = list(itertools.islice(filas, tamano_bloque))
+            if not bloque:
+                break
+            nuevas = {fila[0] for fila in bloque}
+            nuevas.update(fila[1] for fila in bloque)
+            for ciudad in sorted(nuevas.difference(ids)):
+                ids[ciudad] = len(ciudades)
+                ciudades.append(ciudad)
+            origenes.extend([ids[fila[0]] for fila in bloque])
+            destinos.extend([ids[fila[1]] for fila in bloque])
+            costos.extend([float(fila[2]) for fila in bloque])
+            duraciones.extend([float(fila[3]) for fila in bloque])
+
+        return cls._ordenar_por_origen(ciudades, origenes, destinos, costos, duraciones, ids)
+
+    @classmethod
+    def _ordenar_por_origen(cls, ciudades, origenes, destinos, costos, duraciones, ids=None):
+        # Ordenamiento por conteo: cada tramo va a la siguiente posición libre
+        # del bloque de su origen, así se conserva el orden de los tramos del
+        # archivo y la construcción es O(N)
+        conteos = Counter(origenes)
+        desplazamientos = array('q', [0]) * (len(ciudades) + 1)
+        for i in range(len(ciudades)):
+            desplazamientos[i + 1] = desplazamientos[i] + conteos.get(i, 0)
+
+        siguiente = desplazamientos[:-1]
+        orden = array('q', [0]) * len(origenes)
+        for i, origen in enumerate(origenes):
+            orden[siguiente[origen]] = i
+            siguiente[origen] += 1
+        destinos_csr = array('q', map(destinos.__getitem__, orden))
+        costos_csr = array('d', map(costos.__getitem__, orden))
+        duraciones_csr = array('d', map(duraciones.__getitem__, orden))
+
+        return cls(ciudades, desplazamientos, destinos_csr, costos_csr, duraciones_csr, ids)
+
+    def invertido(self):
+        origenes = array('q')
+        for ciudad in range(len(self.ciudades)):
+            grado = self.desplazamientos[ciudad + 1] - self.desplazamientos[ciudad]
+            origenes.extend([ciudad] * grado)
+        return self._ordenar_por_origen(self.ciudades, self.destinos, origenes,
+                                        self.costos, self.duraciones, self.ids)
+
+    def __contains__(self, ciudad):
+        i = self.ids.get(ciudad)
+        return i is not None and self.desplazamientos[i + 1] > self.desplazamientos[i]
+
+    def keys(self):
+        return (ciudad for ciudad in self.ciudades if ciudad in self)
+
+    def numero_tramos(self):
+        return len(self.destinos)
+
+    def vecinos(self, ciudad):
+        i = self.ids.get(ciudad)
+        if i is None:
+            return iter(())
+        inicio, fin = self.desplazamientos[i], self.desplazamientos[i + 1]
+        return zip(map(self.ciudades.__getitem__, self.destinos[inicio:fin]),
+                   self.costos[inicio:fin], self.duraciones[inicio:fin])
+
+
+def leer_csv(nombre_archivo, tamano_bloque=TAMANO_BLOQUE):
+    with open(nombre_archivo, 'r', encoding='utf-8', newline='') as archivo:
+        lector = csv.reader(archivo)
+        next(lector)
+        return GrafoCompacto.desde_filas(lector, tamano_bloque)
+
+
+def huella_archivo(nombre_archivo):
+    sha = hashlib.sha256()
+    with open(nombre_archivo, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.digest()
+
+
+def guardar_instantanea(grafo, inverso, nombre_archivo, estado, huella):
+    nombres = '\n'.join(grafo.ciudades).encode('utf-8')
+    relleno = -(CABECERA.size + len(nombres)) % 8
+    temporal = f"{nombre_archivo}.tmp"
+    with open(temporal, 'wb') as archivo:
+        archivo.write(CABECERA.pack(MAGIA_INSTANTANEA, VERSION_INSTANTANEA, estado.st_mtime_ns,
+                                    estado.st_size, huella, len(grafo.ciudades),
+                                    grafo.numero_tramos(), len(nombres)))
+        archivo.write(nombres)
+        archivo.write(b'\0' * relleno)
+        for g in (grafo, inverso):
+            for arreglo in (g.desplazamientos, g.destinos, g.costos, g.duraciones):
+                arreglo.tofile(archivo)
+    os.replace(temporal, nombre_archivo)
+
+
+def leer_cabecera(nombre_archivo):
+    try:
+        with open(nombre_archivo, 'rb') as archivo:
+            datos = archivo.read(CABECERA.size)
+    except OSError:
+        return None
+    if len(datos) < CABECERA.size:
+        return None
+    cabecera = CABECERA.unpack(datos)
+    if cabecera[0] != MAGIA_INSTANTANEA or cabecera[1] != VERSION_INSTANTANEA:
+        return None
+    return cabecera
+
+
+def actualizar_cabecera(nombre_archivo, cabecera):
+    # Solo se reescribe la cabecera; los arreglos no cambian
+    with open(nombre_archivo, 'r+b') as archivo:
+        archivo.write(CABECERA.pack(*cabecera))
+
+
+def mapear_instantanea(nombre_archivo, cabecera):
+    # Los arreglos del grafo quedan como vistas sobre el archivo mapeado: no se
+    # copian a memoria hasta que se leen
+    _, _, _, _, _, n_ciudades, n_tramos, bytes_nombres = cabecera
+    with open(nombre_archivo, 'rb') as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    vista = memoryview(mapa)
+    inicio = CABECERA.size
+    ciudades = bytes(vista[inicio:inicio + bytes_nombres]).decode('utf-8').split('\n') if n_ciudades else []
+    posicion = inicio + bytes_nombres + (-(inicio + bytes_nombres) % 8)
+
+    def siguiente_arreglo(tipo, cantidad):
+        nonlocal posicion
+        fin = posicion + 8 * cantidad
+        arreglo = vista[posicion:fin].cast(tipo)
+        posicion = fin
+        return arreglo
+
+    grafos = []
+    ids = {ciudad: i for i, ciudad in enumerate(ciudades)}
+    for _ in range(2):
+        grafos.append(GrafoCompacto(ciudades,
+                                    siguiente_arreglo('q', n_ciudades + 1),
+                                    siguiente_arreglo('q', n_tramos),
+                                    siguiente_arreglo('d', n_tramos),
+                                    siguiente_arreglo('d', n_tramos),
+                                    ids))
+    return grafos[0], grafos[1]
+
+
+def cargar_con_instantanea(nombre_archivo, nombre_instantanea=None, tamano_bloque=TAMANO_BLOQUE):
+    # La instantánea sirve si el CSV no cambió: primero se compara mtime y
+    # tamaño; si el mtime cambió se compara el sha256 del contenido
+    nombre_instantanea = nombre_instantanea or f"{nombre_archivo}.grafo"
+    estado = os.stat(nombre_archivo)
+    cabecera = leer_cabecera(nombre_instantanea)
+    if cabecera and (cabecera[2], cabecera[3]) == (estado.st_mtime_ns, estado.st_size):
+        return mapear_instantanea(nombre_instantanea, cabecera)
+
+    huella = huella_archivo(nombre_archivo)
+    if cabecera and cabecera[3] == estado.st_size and cabecera[4] == huella:
+        # Mismo contenido con otro mtime: se actualiza la cabecera para que
+        # el próximo arranque no tenga que volver a calcular el sha256
+        cabecera = cabecera[:2] + (estado.st_mtime_ns,) + cabecera[3:]
+        try:
+            actualizar_cabecera(nombre_instantanea, cabecera)
+        except OSError as error:
+            print(f"Advertencia: no se pudo actualizar la instantánea {nombre_instantanea}: {error}")
+        return mapear_instantanea(nombre_instantanea, cabecera)
+
+    grafo = leer_csv(nombre_archivo, tamano_bloque)
+    inverso = grafo.invertido()
+    try:
+        guardar_instantanea(grafo, inverso, nombre_instantanea, estado, huella)
+    except OSError as error:
+        print(f"Advertencia: no se pudo guardar la instantánea {nombre_instantanea}: {error}")
+    return grafo, inverso
@@ -0,0 +1,109 @@
+import json
+import os
+
+TAMANO_LOTE = 20
+RESUMEN_CADA = 1000
+
+
+class RegistroHistorial:
+    # Historial en formato JSON Lines: cada búsqueda se agrega al final del
+    # archivo, sin reescribir lo anterior. Los registros se acumulan en
+    # memoria y se escriben por lotes. Cada resumen_cada búsquedas se agrega
+    # un registro 'resumen' con las estadísticas acumuladas hasta ese punto,
+    # así al cargar solo se recalculan las búsquedas posteriores al último.
+    # Los resúmenes viejos (y los 'ruta_popular' de versiones anteriores) se
+    # descartan al compactar, que reescribe todas las búsquedas; por eso solo
+    # se compacta cuando ocupan al menos la cuarta parte de lo que ocupan
+    # ellas: el archivo crece geométricamente entre compactaciones y la
+    # escritura total queda lineal.
+
+    def __init__(self, nombre_archivo, tamano_lote=TAMANO_LOTE, resumen_cada=RESUMEN_CADA):
+        self.nombre_archivo = nombre_archivo
+        self.tamano_lote = tamano_lote
+        self.resumen_cada = resumen_cada
+        self.pendientes = []
+        self._reiniciar_contadores()
+
+    def _reiniciar_contadores(self):
+        self.busquedas = 0
+        self.busquedas_sin_resumen = 0
+        # Tamaño en caracteres de las líneas de búsquedas, del último resumen
+        # y de las que se descartan al compactar
+        self.tamano_busquedas = 0
+        self.tamano_resumen = 0
+        self.tamano_descartable = 0
+
+    def existe(self):
+        return os.path.exists(self.nombre_archivo)
+
+    def leer(self):
+        # Se lee línea por línea; una línea incompleta (por ejemplo, tras un
+        # cierre inesperado) se descarta sin perder el resto del historial
+        self._reiniciar_contadores()
+        try:
+            with open(self.nombre_archivo, 'r', encoding='utf-8') as archivo:
+                for numero, linea in enumerate(archivo, 1):
+                    if not linea.strip():
+                        continue
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError:
+                        print(f"Aviso: se ignoró la línea {numero} del historial por estar dañada.")
+                        continue
+                    self._contar(registro, len(linea))
+                    yield registro
+        except FileNotFoundError:
+            return
+
+    def _contar(self, registro, tamano):
+        tipo = registro.get('tipo')
+        if tipo == 'busqueda':
+            self.busquedas += 1
+            self.busquedas_sin_resumen += 1
+            self.tamano_busquedas += tamano
+        elif tipo == 'resumen':
+            # El resumen anterior queda reemplazado por este
+            self.busquedas_sin_resumen = 0
+            self.tamano_descartable += self.tamano_resumen
+            self.tamano_resumen = tamano
+        else:
+            self.tamano_descartable += tamano
+
+    def agregar(self, registro):
+        self.pendientes.append(json.dumps(registro, ensure_ascii=False))
+        self._contar(registro, len(self.pendientes[-1]) + 1)
+        if len(self.pendientes) >= self.tamano_lote:
+            self.vaciar()
+
+    def agregar_lote(self, registros):
+        # Todos los registros en una sola escritura
+        for registro in registros:
+            self.pendientes.append(json.dumps(registro, ensure_ascii=False))
+            self._contar(registro, len(self.pendientes[-1]) + 1)
+        self.vaciar()
+
+    def vaciar(self):
+        if not self.pendientes:
+            return
+        with open(self.nombre_archivo, 'a', encoding='utf-8') as archivo:
+            archivo.write('\n'.join(self.pendientes) + '\n')
+        self.pendientes = []
+
+    def necesita_resumen(self):
+        return self.busquedas_sin_resumen >= self.resumen_cada
+
+    def necesita_compactar(self):
+        return self.tamano_descartable > 0 and 4 * self.tamano_descartable >= self.tamano_busquedas
+
+    def compactar(self, registros):
+        # Reescribe el archivo con el estado actual completo, que debe terminar
+        # en un registro 'resumen'; los pendientes ya están incluidos en ese estado
+        temporal = f"{self.nombre_archivo}.tmp"
+        self._reiniciar_contadores()
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            for registro in registros:
+                linea = json.dumps(registro, ensure_ascii=False) + '\n'
+                self._contar(registro, len(linea))
+                archivo.write(linea)
+        os.replace(temporal, self.nombre_archivo)
+        self.pendientes = []
@@ -0,0 +1,206 @@
+import argparse
+import csv
+import random
+import re
+from array import array
+from bisect import bisect_left
+
+RUTA_HORARIOS = "PROYECTOFINAL/horarios_vuelos.csv"
+MINUTOS_POR_DIA = 24 * 60
+# Tiempo mínimo entre la llegada de un vuelo y la salida del siguiente en la
+# misma ciudad (no se aplica en la ciudad de origen)
+TIEMPO_MINIMO_CONEXION = 45
+# El horario es diario; se repite durante estos días para que un vuelo de la
+# noche pueda conectar con uno del día siguiente
+DIAS_HORIZONTE = 3
+# HH:MM, con +N si es N días después (por ejemplo, "01:30+1")
+PATRON_HORA = re.compile(r"(\d{1,2}):(\d{2})(?:\+(\d+))?")
+
+
+def leer_hora(texto):
+    # Minutos desde las 00:00 del primer día
+    coincidencia = PATRON_HORA.fullmatch(texto.strip())
+    if coincidencia is None:
+        raise ValueError(f"Hora inválida: {texto!r}")
+    horas, minutos, dias = int(coincidencia[1]), int(coincidencia[2]), int(coincidencia[3] or 0)
+    if horas >= 24 or minutos >= 60:
+        raise ValueError(f"Hora inválida: {texto!r}")
+    return dias * MINUTOS_POR_DIA + horas * 60 + minutos
+
+
+def formatear_hora(minutos):
+    dias, minutos = divmod(int(minutos), MINUTOS_POR_DIA)
+    hora = f"{minutos // 60:02d}:{minutos % 60:02d}"
+    return f"{hora}+{dias}" if dias else hora
+
+
+class HorarioVuelos:
+    # Conexiones (un vuelo en un día concreto) en arreglos planos ordenados
+    # por hora de salida: la conexión i sale de origenes[i] a salidas[i] y
+    # llega a destinos[i] a llegadas[i]. Las ciudades se guardan como enteros
+    # y las horas como minutos desde las 00:00 del primer día, como en
+    # GrafoCompacto.
+
+    def __init__(self, archivo_horarios=RUTA_HORARIOS, dias=DIAS_HORIZONTE,
+                 conexion_minima=TIEMPO_MINIMO_CONEXION, conexiones_minimas=None):
+        self.ciudades = []
+        self.ids = {}
+        self.nombres = {}   # nombre en minúsculas -> nombre de la ciudad
+        self.vuelos = []
+        self.origenes = array('q')
+        self.destinos = array('q')
+        self.salidas = array('q')
+        self.llegadas = array('q')
+        self.costos = array('d')
+        try:
+            self._cargar(archivo_horarios, dias)
+        except FileNotFoundError:
+            print(f"Error: No se encontró el archivo {archivo_horarios}")
+
+        # Tiempo mínimo de conexión de cada ciudad; conexiones_minimas permite
+        # cambiarlo en aeropuertos concretos
+        self.conexiones_minimas = array('q', [conexion_minima]) * len(self.ciudades)
+        for ciudad, minutos in (conexiones_minimas or {}).items():
+            if ciudad in self.ids:
+                self.conexiones_minimas[self.ids[ciudad]] = minutos
+
+    def _cargar(self, nombre_archivo, dias):
+        with open(nombre_archivo, 'r', encoding='utf-8', newline='') as archivo:
+            lector = csv.reader(archivo)
+            next(lector)
+            vuelos = [(fila[0], fila[1], fila[2], leer_hora(fila[3]), leer_hora(fila[4]), float(fila[5]))
+                      for fila in lector]
+
+        for ciudad in sorted({vuelo[1] for vuelo in vuelos} | {vuelo[2] for vuelo in vuelos}):
+            self.ids[ciudad] = len(self.ciudades)
+            self.nombres[ciudad.lower()] = ciudad
+            self.ciudades.append(ciudad)
+
+        # Cada vuelo diario aparece una vez por día del horizonte; sorted es
+        # estable, así los vuelos que salen a la misma hora conservan el orden
+        # del archivo
+        conexiones = sorted(((salida + dia * MINUTOS_POR_DIA, llegada + dia * MINUTOS_POR_DIA, indice)
+                             for dia in range(dias)
+                             for indice, (_, _, _, salida, llegada, _) in enumerate(vuelos)),
+                            key=lambda conexion: conexion[0])
+        for salida, llegada, indice in conexiones:
+            vuelo, origen, destino, _, _, costo = vuelos[indice]
+            self.vuelos.append(vuelo)
+            self.origenes.append(self.ids[origen])
+            self.destinos.append(self.ids[destino])
+            self.salidas.append(salida)
+            self.llegadas.append(llegada)
+            self.costos.append(costo)
+
+    def buscar_ciudad(self, nombre):
+        # Nombre de la ciudad tal como está en el horario, sin distinguir
+        # mayúsculas, o None si no existe
+        return self.nombres.get(nombre.strip().lower())
+
+    def llegada_mas_temprana(self, origen, destino, hora_salida=0):
+        # Connection Scan Algorithm: recorre una sola vez las conexiones que
+        # salen desde hora_salida, en orden. Una conexión se puede tomar si
+        # sale de una ciudad a la que ya se llegó con al menos el tiempo
+        # mínimo de conexión; si llega antes que lo conocido a su destino, se
+        # guarda como la conexión de entrada a esa ciudad. El recorrido
+        # termina en cuanto las salidas no pueden mejorar la llegada al
+        # destino. Retorna el itinerario o None si no hay uno en el horizonte.
+        if origen not in self.ids or destino not in self.ids or origen == destino:
+            return None
+        id_origen = self.ids[origen]
+        id_destino = self.ids[destino]
+        infinito = float('inf')
+        llegada = [infinito] * len(self.ciudades)
+        # Hora desde la que se puede salir de cada ciudad
+        disponible = [infinito] * len(self.ciudades)
+        entrada = [-1] * len(self.ciudades)
+        llegada[id_origen] = disponible[id_origen] = hora_salida
+
+        salidas = self.salidas
+        origenes = self.origenes
+        destinos = self.destinos
+        llegadas = self.llegadas
+        minimos = self.conexiones_minimas
+        # Se recorre por índice para no copiar el arreglo desde inicio
+        for i in range(bisect_left(salidas, hora_salida), len(salidas)):
+            salida = salidas[i]
+            if salida >= llegada[id_destino]:
+                break
+            if salida < disponible[origenes[i]]:
+                continue
+            ciudad = destinos[i]
+            if llegadas[i] < llegada[ciudad]:
+                llegada[ciudad] = llegadas[i]
+                disponible[ciudad] = llegadas[i] + minimos[ciudad]
+                entrada[ciudad] = i
+
+        if entrada[id_destino] < 0:
+            return None
+        conexiones = []
+        ciudad = id_destino
+        while ciudad != id_origen:
+            conexiones.append(entrada[ciudad])
+            ciudad = origenes[entrada[ciudad]]
+        return self._itinerario(conexiones[::-1], hora_salida)
+
+    def _itinerario(self, conexiones, hora_salida):
+        tramos = [{
+            'vuelo': self.vuelos[i],
+            'origen': self.ciudades[self.origenes[i]],
+            'destino': self.ciudades[self.destinos[i]],
+            'salida': self.salidas[i],
+            'llegada': self.llegadas[i],
+            'costo': self.costos[i]
+        } for i in conexiones]
+        vuelo = sum(tramo['llegada'] - tramo['salida'] for tramo in tramos)
+        total = tramos[-1]['llegada'] - tramos[0]['salida']
+        # Las duraciones se expresan en horas, como en las rutas
+        return {
+            'tramos': tramos,
+            'hora_consulta': hora_salida,
+            'salida': tramos[0]['salida'],
+            'llegada': tramos[-1]['llegada'],
+            'duracion': total / 60,
+            'espera': (total - vuelo) / 60,
+            'costo': sum(tramo['costo'] for tramo in tramos)
+        }
+
+
+def generar_horarios(archivo_rutas, archivo_horarios, salidas_por_dia=(2, 4), semilla=42):
+    # Horario diario sintético a partir de las rutas: cada tramo tiene entre
+    # salidas_por_dia[0] y salidas_por_dia[1] vuelos entre las 05:00 y las
+    # 23:00, con la duración del tramo y un precio cercano a su costo
+    aleatorio = random.Random(semilla)
+    with open(archivo_rutas, 'r', encoding='utf-8') as archivo:
+        lector = csv.reader(archivo)
+        next(lector)
+        rutas = list(lector)
+
+    vuelos = []
+    for origen, destino, costo, duracion in rutas:
+        for _ in range(aleatorio.randint(*salidas_por_dia)):
+            salida = aleatorio.randrange(5 * 60, 23 * 60, 5)
+            llegada = salida + round(float(duracion) * 60)
+            precio = round(float(costo) * aleatorio.uniform(0.85, 1.25), 2)
+            vuelos.append([origen, destino, salida, llegada, precio])
+    vuelos.sort(key=lambda vuelo: (vuelo[2], vuelo[0], vuelo[1]))
+
+    with open(archivo_horarios, 'w', encoding='utf-8', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['vuelo', 'origen', 'destino', 'salida', 'llegada', 'costo'])
+        for numero, (origen, destino, salida, llegada, precio) in enumerate(vuelos, 1):
+            escritor.writerow([f"EA{numero:04d}", origen, destino, formatear_hora(salida),
+                               formatear_hora(llegada), f"{precio:.2f}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el horario diario de vuelos a partir de las rutas.")
+    parser.add_argument('--rutas', default="PROYECTOFINAL/rutas_vuelos.csv")
+    parser.add_argument('--salida', default=RUTA_HORARIOS)
+    parser.add_argument('--semilla', type=int, default=42)
+    argumentos = parser.parse_args()
+    generar_horarios(argumentos.rutas, argumentos.salida, semilla=argumentos.semilla)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import heapq
+import mmap
+import os
+import struct
+from array import array
+
+from grafo_compacto import huella_archivo
+
+INFINITO = float('inf')
+SIN_RUTA = 0xFFFF
+MAGIA_INDICE = b'INDICE02'
+# magia, mtime_ns y tamaño del CSV, sha256 del CSV, ciudades, bytes de nombres.
+# Los nombres se rellenan hasta un múltiplo de 8 bytes para que las matrices
+# queden alineadas al mapear el archivo.
+CABECERA_INDICE = struct.Struct('<8sqq32sqq')
+
+
+class CotasHacia:
+    # Vista de una fila del índice con la interfaz de diccionario que usan las
+    # búsquedas: ciudad -> cota hasta el destino
+
+    def __init__(self, ids, valores, inalcanzable):
+        self.ids = ids
+        self.valores = valores
+        self.inalcanzable = inalcanzable
+
+    def __contains__(self, ciudad):
+        i = self.ids.get(ciudad)
+        return i is not None and self.valores[i] != self.inalcanzable
+
+    def __getitem__(self, ciudad):
+        return self.valores[self.ids[ciudad]]
+
+
+class IndiceDistancias:
+    # Costo mínimo y menor número de tramos entre todo par de ciudades. Las
+    # matrices se guardan por destino: la fila d contiene la cota desde cada
+    # ciudad hasta d, así cotas_hacia(d) es un bloque contiguo.
+
+    def __init__(self, ciudades, costos, tramos):
+        self.ciudades = ciudades
+        self.ids = {ciudad: i for i, ciudad in enumerate(ciudades)}
+        self.costos = costos
+        self.tramos = tramos
+
+    @classmethod
+    def construir(cls, ciudades, conexiones_inversas):
+        # Un Dijkstra y un BFS sobre el grafo inverso por cada destino
+        n = len(ciudades)
+        ids = {ciudad: i for i, ciudad in enumerate(ciudades)}
+        inverso = [[(ids[anterior], costo) for anterior, costo, _ in conexiones_inversas(ciudad)]
+                   for ciudad in ciudades]
+        costos = array('d')
+        tramos = array('H')
+
+        for destino in range(n):
+            fila_costos = [INFINITO] * n
+            fila_costos[destino] = 0.0
+            cola = [(0.0, destino)]
+            while cola:
+                costo, ciudad = heapq.heappop(cola)
+                if costo > fila_costos[ciudad]:
+                    continue
+                for anterior, costo_tramo in inverso[ciudad]:
+                    nuevo_costo = costo + costo_tramo
+                    if nuevo_costo < fila_costos[anterior]:
+                        fila_costos[anterior] = nuevo_costo
+                        heapq.heappush(cola, (nuevo_costo, anterior))
+
+            fila_tramos = [SIN_RUTA] * n
+            fila_tramos[destino] = 0
+            frontera = [destino]
+            nivel = 0
+            while frontera:
+                nivel += 1
+                siguiente_frontera = []
+                for ciudad in frontera:
+                    for anterior, _ in inverso[ciudad]:
+                        if fila_tramos[anterior] == SIN_RUTA:
+                            fila_tramos[anterior] = nivel
+                            siguiente_frontera.append(anterior)
+                frontera = siguiente_frontera
+
+            costos.extend(fila_costos)
+            tramos.extend(fila_tramos)
+
+        return cls(list(ciudades), costos, tramos)
+
+    def cotas_hacia(self, destino):
+        j = self.ids.get(destino)
+        if j is None:
+            return CotasHacia({}, (), None), CotasHacia({}, (), None)
+        n = len(self.ciudades)
+        return (CotasHacia(self.ids, self.costos[j * n:(j + 1) * n], INFINITO),
+                CotasHacia(self.ids, self.tramos[j * n:(j + 1) * n], SIN_RUTA))
+
+    def ruta_posible(self, origen, destino, max_precio=INFINITO, max_escalas=INFINITO):
+        # Condición necesaria en O(1): si el costo mínimo o el menor número de
+        # tramos ya violan los límites, ninguna ruta puede cumplirlos
+        if origen == destino:
+            return True
+        i, j = self.ids.get(origen), self.ids.get(destino)
+        if i is None or j is None:
+            return False
+        posicion = j * len(self.ciudades) + i
+        if self.costos[posicion] == INFINITO:
+            return False
+        return self.costos[posicion] <= max_precio and self.tramos[posicion] <= max_escalas + 1
+
+    def guardar(self, nombre_archivo, estado, huella):
+        nombres = '\n'.join(self.ciudades).encode('utf-8')
+        relleno = -(CABECERA_INDICE.size + len(nombres)) % 8
+        temporal = f"{nombre_archivo}.tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(CABECERA_INDICE.pack(MAGIA_INDICE, estado.st_mtime_ns, estado.st_size,
+                                               huella, len(self.ciudades), len(nombres)))
+            archivo.write(nombres)
+            archivo.write(b'\0' * relleno)
+            self.costos.tofile(archivo)
+            self.tramos.tofile(archivo)
+        os.replace(temporal, nombre_archivo)
+
+    @classmethod
+    def cargar(cls, nombre_archivo, archivo_rutas):
+        # Solo se usa el índice guardado si corresponde al CSV actual. Como en
+        # grafo_compacto.mapear_instantanea, las matrices quedan como vistas
+        # sobre el archivo mapeado y solo se leen las filas que se consultan.
+        try:
+            with open(nombre_archivo, 'rb') as archivo:
+                cabecera = archivo.read(CABECERA_INDICE.size)
+            if len(cabecera) < CABECERA_INDICE.size:
+                return None
+            magia, mtime, tamano, huella, n, bytes_nombres = CABECERA_INDICE.unpack(cabecera)
+            estado = os.stat(archivo_rutas)
+            if magia != MAGIA_INDICE or tamano != estado.st_size:
+                return None
+            if mtime != estado.st_mtime_ns:
+                if huella != huella_archivo(archivo_rutas):
+                    return None
+                actualizar_mtime(nombre_archivo, cabecera, estado.st_mtime_ns)
+            with open(nombre_archivo, 'rb') as archivo:
+                mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        vista = memoryview(mapa)
+        inicio = CABECERA_INDICE.size
+        fin_nombres = inicio + bytes_nombres
+        inicio_costos = fin_nombres + (-fin_nombres % 8)
+        inicio_tramos = inicio_costos + 8 * n * n
+        if len(vista) < inicio_tramos + 2 * n * n:
+            return None
+        ciudades = bytes(vista[inicio:fin_nombres]).decode('utf-8').split('\n') if n else []
+        return cls(ciudades, vista[inicio_costos:inicio_tramos].cast('d'),
+                   vista[inicio_tramos:inicio_tramos + 2 * n * n].cast('H'))
+
+
+def actualizar_mtime(nombre_archivo, cabecera, mtime):
+    # El CSV tiene el mismo contenido con otro mtime: se actualiza la cabecera
+    # para que el próximo arranque no vuelva a calcular el sha256
+    magia, _, tamano, huella, n, bytes_nombres = CABECERA_INDICE.unpack(cabecera)
+    try:
+        with open(nombre_archivo, 'r+b') as archivo:
+            archivo.write(CABECERA_INDICE.pack(magia, mtime, tamano, huella, n, bytes_nombres))
+    except OSError as error:
+        print(f"Advertencia: no se pudo actualizar el índice {nombre_archivo}: {error}")
+
+
+def cargar_o_construir(archivo_rutas, ciudades, conexiones_inversas, nombre_indice=None):
+    nombre_indice = nombre_indice or f"{archivo_rutas}.indice"
+    indice = IndiceDistancias.cargar(nombre_indice, archivo_rutas)
+    if indice is not None and sorted(indice.ciudades) == sorted(ciudades):
+        return indice
+
+    indice = IndiceDistancias.construir(ciudades, conexiones_inversas)
+    try:
+        indice.guardar(nombre_indice, os.stat(archivo_rutas), huella_archivo(archivo_rutas))
+    except OSError as error:
+        print(f"Advertencia: no se pudo guardar el índice {nombre_indice}: {error}")
+    return indice
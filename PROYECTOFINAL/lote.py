@@ -0,0 +1,133 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from main import BuscadorRutas, RUTA_HISTORIAL, crear_entrada_busqueda
+
+CONSULTAS_POR_TAREA = 64
+TAREAS_POR_PROCESO = 4
+
+# Buscador de solo lectura de cada proceso de trabajo. Con 'fork' los procesos
+# lo heredan del proceso principal sin copiarlo ni serializarlo; sin 'fork'
+# cada proceso lo carga una vez (en modo compacto, mapeando la misma
+# instantánea binaria).
+_buscador = None
+
+
+def compartir_buscador(buscador):
+    # Buscador que heredan los procesos creados después con 'fork'
+    global _buscador
+    _buscador = buscador
+
+
+def iniciar_trabajador(archivo_rutas, compacto, indexar):
+    # Inicializador de los procesos de trabajo (también los del servidor)
+    global _buscador
+    if _buscador is None:
+        _buscador = BuscadorRutas(archivo_rutas, archivo_historial=None,
+                                  compacto=compacto, indexar=indexar)
+
+
+def leer_consultas(nombre_archivo):
+    # CSV con columnas origen,destino y opcionalmente max_precio,max_escalas;
+    # un valor vacío significa sin límite
+    with open(nombre_archivo, 'r', encoding='utf-8', newline='') as archivo:
+        for fila in csv.DictReader(archivo):
+            max_precio = fila.get('max_precio') or ''
+            max_escalas = fila.get('max_escalas') or ''
+            yield (fila['origen'].strip(), fila['destino'].strip(),
+                   float(max_precio) if max_precio.strip() else float('inf'),
+                   int(max_escalas) if max_escalas.strip() else float('inf'))
+
+
+def resolver_consultas(consultas):
+    resultados = []
+    for origen, destino, max_precio, max_escalas in consultas:
+        rutas = _buscador.buscar_rutas(origen, destino, max_precio, max_escalas)
+        frontera = _buscador.buscar_frontera(origen, destino, max_precio, max_escalas) if rutas else []
+        resultados.append({
+            'origen': origen,
+            'destino': destino,
+            'max_precio': None if max_precio == float('inf') else max_precio,
+            'max_escalas': None if max_escalas == float('inf') else max_escalas,
+            'rutas': rutas,
+            'frontera': frontera,
+            'entrada': crear_entrada_busqueda(origen, destino, rutas, frontera) if rutas else None
+        })
+    return resultados
+
+
+def ejecutar_lote(consultas, archivo_rutas="PROYECTOFINAL/rutas_vuelos.csv", procesos=None,
+                  compacto=True, indexar=False, buscador=None):
+    # Generador: entrega los resultados a medida que terminan (no en el orden
+    # de entrada). Solo se mantienen TAREAS_POR_PROCESO tareas pendientes por
+    # proceso, así el archivo de consultas nunca se carga completo en memoria.
+    procesos = procesos or os.cpu_count() or 1
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context('fork' if 'fork' in metodos else None)
+    if contexto.get_start_method() == 'fork':
+        compartir_buscador(buscador or BuscadorRutas(archivo_rutas, archivo_historial=None,
+                                                     compacto=compacto, indexar=indexar))
+
+    consultas = iter(consultas)
+    with ProcessPoolExecutor(procesos, mp_context=contexto, initializer=iniciar_trabajador,
+                             initargs=(archivo_rutas, compacto, indexar)) as ejecutor:
+        pendientes = set()
+        while True:
+            while len(pendientes) < procesos * TAREAS_POR_PROCESO:
+                tarea = list(itertools.islice(consultas, CONSULTAS_POR_TAREA))
+                if not tarea:
+                    break
+                pendientes.add(ejecutor.submit(resolver_consultas, tarea))
+            if not pendientes:
+                break
+            terminadas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in terminadas:
+                yield from futuro.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resuelve un lote de consultas de rutas en paralelo.")
+    parser.add_argument('consultas', help="CSV con columnas origen,destino[,max_precio,max_escalas]")
+    parser.add_argument('-o', '--salida', help="archivo JSON Lines de resultados (por defecto, la salida estándar)")
+    parser.add_argument('-p', '--procesos', type=int, default=None)
+    parser.add_argument('--rutas', default="PROYECTOFINAL/rutas_vuelos.csv")
+    parser.add_argument('--historial', default=RUTA_HISTORIAL)
+    parser.add_argument('--sin-historial', action='store_true',
+                        help="no registrar las consultas en el historial")
+    parser.add_argument('--indexar', action='store_true')
+    argumentos = parser.parse_args()
+
+    buscador = BuscadorRutas(argumentos.rutas,
+                             None if argumentos.sin_historial else argumentos.historial,
+                             compacto=True, indexar=argumentos.indexar)
+    salida = open(argumentos.salida, 'w', encoding='utf-8') if argumentos.salida else sys.stdout
+    entradas = []
+    total = 0
+    try:
+        for resultado in ejecutar_lote(leer_consultas(argumentos.consultas), argumentos.rutas,
+                                       argumentos.procesos, indexar=argumentos.indexar,
+                                       buscador=buscador):
+            entrada = resultado.pop('entrada')
+            if entrada is not None:
+                entradas.append(entrada)
+            salida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+            total += 1
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    # El historial y las estadísticas se actualizan una sola vez al final,
+    # con una única escritura del historial
+    buscador.registrar_entradas(entradas)
+    buscador.guardar_historial()
+    print(f"{total} consultas resueltas, {len(entradas)} con rutas.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,208 @@
+import argparse
 import csv
 from datetime import datetime
+import heapq
+import itertools
 import json
 from pathlib import Path
 from collections import Counter
 from typing import List, Tuple, Dict
 
+from grafo_compacto import GrafoCompacto, cargar_con_instantanea
+from cache import CacheConsultas
+from estadisticas import ResumenMetrica, TopRutas
+from historial import RegistroHistorial
+from horarios import HorarioVuelos, formatear_hora, leer_hora
+from indice import cargar_o_construir
+
+RUTA_HISTORIAL = "PROYECTOFINAL/historial_busquedas.jsonl"
+EPSILON = 1e-9
+MAX_RUTAS_MOSTRADAS = 10
+
 class BuscadorRutas:
-    def __init__(self):
+    def __init__(self, archivo_rutas="PROYECTOFINAL/rutas_vuelos.csv",
+                 archivo_historial=RUTA_HISTORIAL, compacto=False, indexar=False):
+        self.compacto = compacto
+        self.indexar = indexar
+        self.indice = None
+        self.cache = CacheConsultas()
         self.grafo = {}
+        self.grafo_inverso = {}
         self.historial_busquedas = []
-        self.estadisticas = {'rutas_populares': Counter()}
-        self.cargar_grafo("PROYECTOFINAL/rutas_vuelos.csv")
-        self.cargar_historial()
+        self.estadisticas = estadisticas_vacias()
+        self.registro_historial = None
+        self.cargar_grafo(archivo_rutas)
+        # Sin archivo de historial las búsquedas no se registran (por ejemplo,
+        # en los procesos que solo atienden consultas)
+        if archivo_historial is not None:
+            self.cargar_historial(archivo_historial)
 
     def cargar_grafo(self, nombre_archivo):
+        # Un grafo nuevo invalida todos los resultados guardados en la cache
+        self.cache.invalidar()
+        self.indice = None
+        self.archivo_rutas = nombre_archivo
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
-                lector = csv.reader(archivo)
-                next(lector)
-                self.grafo = {}
-                
-                for fila in lector:
-                    origen, destino, costo, duracion = fila
-                    if origen not in self.grafo:
-                        self.grafo[origen] = []
-                    self.grafo[origen].append({
-                        'destino': destino,
-                        'costo': float(costo),
-                        'duracion': float(duracion)
-                    })
-                    
+            if self.compacto:
+                self.grafo, self.grafo_inverso = cargar_con_instantanea(nombre_archivo)
+            else:
+                self._leer_grafo_csv(nombre_archivo)
         except FileNotFoundError:
             print(f"Error: No se encontró el archivo {nombre_archivo}")
             return
 
-    def cargar_historial(self, nombre_archivo="historial_busquedas.json"):
+        if self.indexar:
+            self.indice = cargar_o_construir(nombre_archivo, self.ciudades(), self._conexiones_inversas)
+
+    def _leer_grafo_csv(self, nombre_archivo):
+        with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
+            lector = csv.reader(archivo)
+            next(lector)
+            self.grafo = {}
+            self.grafo_inverso = {}
+            
+            for fila in lector:
+                origen, destino, costo, duracion = fila
+                if origen not in self.grafo:
+                    self.grafo[origen] = []
+                self.grafo[origen].append({
+                    'destino': destino,
+                    'costo': float(costo),
+                    'duracion': float(duracion)
+                })
+                self.grafo_inverso.setdefault(destino, []).append(
+                    (origen, float(costo), float(duracion)))
+
+    def ciudades(self):
+        if isinstance(self.grafo, GrafoCompacto):
+            return list(self.grafo.ciudades)
+        return sorted(set(self.grafo) | set(self.grafo_inverso))
+
+    def _conexiones(self, ciudad):
+        # Tramos (destino, costo, duracion) que salen de la ciudad, sin importar
+        # si el grafo es el diccionario de listas o un GrafoCompacto
+        if isinstance(self.grafo, GrafoCompacto):
+            return self.grafo.vecinos(ciudad)
+        return ((c['destino'], c['costo'], c['duracion']) for c in self.grafo.get(ciudad, []))
+
+    def _conexiones_inversas(self, ciudad):
+        if isinstance(self.grafo_inverso, GrafoCompacto):
+            return self.grafo_inverso.vecinos(ciudad)
+        return self.grafo_inverso.get(ciudad, [])
+
+    def cargar_historial(self, nombre_archivo=RUTA_HISTORIAL):
+        self.registro_historial = RegistroHistorial(nombre_archivo)
+        self.historial_busquedas = []
+        self.estadisticas = estadisticas_vacias()
+
+        if not self.registro_historial.existe():
+            self._migrar_historial_json(Path(nombre_archivo).with_suffix('.json'))
+            return
+
+        # Solo se acumulan las búsquedas posteriores al último resumen, que ya
+        # incluye todo lo anterior a él en el archivo. Los 'ruta_popular' de
+        # versiones anteriores se ignoran: cada uno acompañaba a una búsqueda,
+        # que ya cuenta para las rutas populares.
+        sin_resumen = []
+        for registro in self.registro_historial.leer():
+            tipo = registro.pop('tipo', None)
+            if tipo == 'busqueda':
+                self.historial_busquedas.append(registro)
+                sin_resumen.append(registro)
+            elif tipo == 'resumen':
+                if 'agregados' in registro:
+                    agregados = registro['agregados']
+                    self.estadisticas['total_busquedas'] = agregados['total_busquedas']
+                    self.estadisticas['precio'] = ResumenMetrica.desde_dict(agregados['precio'])
+                    self.estadisticas['duracion'] = ResumenMetrica.desde_dict(agregados['duracion'])
+                else:
+                    # Los resúmenes anteriores solo traen las rutas populares
+                    for entrada in sin_resumen:
+                        self._acumular_busqueda(entrada)
+                self.estadisticas['rutas_populares'] = Counter(registro['rutas_populares'])
+                sin_resumen = []
+        for entrada in sin_resumen:
+            self._acumular_busqueda(entrada)
+        self.estadisticas['top_rutas'].reconstruir(self.estadisticas['rutas_populares'])
+
+    def _migrar_historial_json(self, nombre_archivo):
+        # Convierte el historial del formato anterior (un único JSON) al registro
+        # de líneas
         try:
             with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
                 data = json.load(archivo)
-                self.historial_busquedas = data['busquedas']
-                self.estadisticas['rutas_populares'].update(data.get('rutas_populares', {}))
         except FileNotFoundError:
-            self.historial_busquedas = []
-            with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
-                json.dump({'busquedas': [], 'rutas_populares': {}}, archivo)
+            return
         except json.JSONDecodeError:
-            print("Error al leer el historial. Creando uno nuevo.")
-            self.historial_busquedas = []
-            with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
-                json.dump({'busquedas': [], 'rutas_populares': {}}, archivo)
-
-    def guardar_historial(self, nombre_archivo="PROYECTOFINAL/historial_busquedas.json"):
-        data = {
-            'busquedas': self.historial_busquedas,
-            'rutas_populares': dict(self.estadisticas['rutas_populares'])
-        }
-        with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
-            json.dump(data, archivo, indent=2, ensure_ascii=False)
-
-    def guardar_busqueda(self, origen, destino, rutas):
-        mejor_ruta = rutas[0] if rutas else None
-        entrada_busqueda = {
-            'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'origen': origen,
-            'destino': destino,
-            'rutas_encontradas': len(rutas),
-            'mejor_precio': mejor_ruta['costo'] if mejor_ruta else None,
-            'mejor_duracion': mejor_ruta['duracion'] if mejor_ruta else None,
-            'menos_escalas': len(mejor_ruta['camino']) - 2 if mejor_ruta else None
+            print("Error al leer el historial anterior. Se iniciará uno nuevo.")
+            return
+        self.historial_busquedas = data.get('busquedas', [])
+        for entrada in self.historial_busquedas:
+            self._acumular_busqueda(entrada)
+        # El contador del formato anterior ya incluye todas las búsquedas
+        self.estadisticas['rutas_populares'] = Counter(data.get('rutas_populares', {}))
+        self.estadisticas['top_rutas'].reconstruir(self.estadisticas['rutas_populares'])
+        self.compactar_historial()
+
+    def guardar_historial(self):
+        if self.registro_historial is not None:
+            self.registro_historial.vaciar()
+
+    def compactar_historial(self):
+        registros = [{'tipo': 'busqueda', **entrada} for entrada in self.historial_busquedas]
+        registros.append(self._registro_resumen())
+        self.registro_historial.compactar(registros)
+
+    def _registro_resumen(self):
+        return {
+            'tipo': 'resumen',
+            'rutas_populares': dict(self.estadisticas['rutas_populares']),
+            'agregados': {
+                'total_busquedas': self.estadisticas['total_busquedas'],
+                'precio': self.estadisticas['precio'].a_dict(),
+                'duracion': self.estadisticas['duracion'].a_dict()
+            }
         }
+
+    def _acumular_busqueda(self, entrada):
+        self.estadisticas['rutas_populares'][f"{entrada['origen']}-{entrada['destino']}"] += 1
+        self.estadisticas['total_busquedas'] += 1
+        if entrada['mejor_precio'] is not None:
+            self.estadisticas['precio'].agregar(entrada['mejor_precio'])
+        if entrada['mejor_duracion'] is not None:
+            self.estadisticas['duracion'].agregar(entrada['mejor_duracion'])
+
+    def _revisar_historial(self):
+        # Se llama después de agregar búsquedas al registro
+        if self.registro_historial.necesita_compactar():
+            self.compactar_historial()
+        elif self.registro_historial.necesita_resumen():
+            self.registro_historial.agregar(self._registro_resumen())
+
+    def guardar_busqueda(self, origen, destino, rutas, frontera=None):
+        self.registrar_entrada(crear_entrada_busqueda(origen, destino, rutas, frontera))
+
+    def registrar_entrada(self, entrada_busqueda):
         self.historial_busquedas.append(entrada_busqueda)
-        self.guardar_historial()
+        self._acumular_busqueda(entrada_busqueda)
+        ruta_key = f"{entrada_busqueda['origen']}-{entrada_busqueda['destino']}"
+        self.estadisticas['top_rutas'].incrementar(ruta_key, self.estadisticas['rutas_populares'])
+        if self.registro_historial is not None:
+            self.registro_historial.agregar({'tipo': 'busqueda', **entrada_busqueda})
+            self._revisar_historial()
+
+    def registrar_entradas(self, entradas):
+        # Equivale a registrar_entrada por cada entrada, pero las rutas más
+        # buscadas se recalculan una vez y las búsquedas se escriben en una
+        # sola escritura, con una sola revisión de resumen o compactación
+        for entrada in entradas:
+            self.historial_busquedas.append(entrada)
+            self._acumular_busqueda(entrada)
+        self.estadisticas['top_rutas'].reconstruir(self.estadisticas['rutas_populares'])
+        if self.registro_historial is None or not entradas:
+            return
+        self.registro_historial.agregar_lote([{'tipo': 'busqueda', **entrada} for entrada in entradas])
+        self._revisar_historial()
 
     def encontrar_todas_las_rutas(self, origen: str, destino: str, max_precio: float = float('inf'),
                                  max_escalas: int = float('inf'), camino=None, costo_total=0.0, duracion_total=0.0):
@@ -91,26 +223,179 @@ class BuscadorRutas:
             return []
             
         rutas = []
-        for conexion in self.grafo[origen]:
-            siguiente = conexion['destino']
+        for siguiente, costo, duracion in self._conexiones(origen):
             if siguiente not in camino_actual:
-                nuevo_costo = costo_total + conexion['costo']
+                nuevo_costo = costo_total + costo
                 if nuevo_costo <= max_precio:
                     nuevas_rutas = self.encontrar_todas_las_rutas(
                         siguiente, destino, max_precio, max_escalas,
-                        camino_actual, nuevo_costo, duracion_total + conexion['duracion']
+                        camino_actual, nuevo_costo, duracion_total + duracion
                     )
                     rutas.extend(nuevas_rutas)
         
         return rutas
 
-    def mostrar_rutas(self, rutas: List[Dict]):
+    def _cotas_destino(self, destino: str) -> Tuple[Dict[str, float], Dict[str, int]]:
+        # Dijkstra y BFS sobre el grafo inverso: costo mínimo y menor número
+        # de tramos desde cada ciudad hasta el destino. Con el índice
+        # precalculado son solo una fila de sus matrices.
+        if self.indice is not None:
+            return self.indice.cotas_hacia(destino)
+
+        cotas_costo = {destino: 0.0}
+        cola = [(0.0, destino)]
+        while cola:
+            costo, ciudad = heapq.heappop(cola)
+            if costo > cotas_costo[ciudad]:
+                continue
+            for anterior, costo_tramo, _ in self._conexiones_inversas(ciudad):
+                nuevo_costo = costo + costo_tramo
+                if nuevo_costo < cotas_costo.get(anterior, float('inf')):
+                    cotas_costo[anterior] = nuevo_costo
+                    heapq.heappush(cola, (nuevo_costo, anterior))
+
+        cotas_tramos = {destino: 0}
+        frontera = [destino]
+        while frontera:
+            siguiente_frontera = []
+            for ciudad in frontera:
+                for anterior, _, _ in self._conexiones_inversas(ciudad):
+                    if anterior not in cotas_tramos:
+                        cotas_tramos[anterior] = cotas_tramos[ciudad] + 1
+                        siguiente_frontera.append(anterior)
+            frontera = siguiente_frontera
+
+        return cotas_costo, cotas_tramos
+
+    def ruta_posible(self, origen: str, destino: str, max_precio: float = float('inf'),
+                     max_escalas: int = float('inf')) -> bool:
+        # Si esto es falso no existe ninguna ruta que cumpla los límites. Con
+        # el índice la respuesta es O(1); sin él cuesta un Dijkstra inverso.
+        if self.indice is not None:
+            return self.indice.ruta_posible(origen, destino, max_precio + EPSILON, max_escalas)
+        return self._cotas_si_posible(origen, destino, max_precio, max_escalas) is not None
+
+    def _cotas_si_posible(self, origen, destino, max_precio, max_escalas):
+        if not (self.indice is None or self.ruta_posible(origen, destino, max_precio, max_escalas)):
+            return None
+        cotas_costo, cotas_tramos = self._cotas_destino(destino)
+        if (origen not in cotas_costo or cotas_costo[origen] > max_precio + EPSILON
+                or cotas_tramos[origen] > max_escalas + 1):
+            return None
+        return cotas_costo, cotas_tramos
+
+    def rutas_mas_baratas(self, origen: str, destino: str, max_precio: float = float('inf'),
+                          max_escalas: int = float('inf')):
+        # Búsqueda best-first (A*) sobre caminos simples: las rutas salen en
+        # orden de costo creciente y se generan solo a medida que se piden
+        cotas = self._cotas_si_posible(origen, destino, max_precio, max_escalas)
+        if cotas is None:
+            return
+        cotas_costo, cotas_tramos = cotas
+
+        max_tramos = max_escalas + 1
+        desempate = itertools.count()
+        cola = [(cotas_costo[origen], next(desempate), 0.0, 0.0, (origen,))]
+
+        while cola:
+            _, _, costo, duracion, camino = heapq.heappop(cola)
+            actual = camino[-1]
+
+            if actual == destino:
+                yield {'camino': list(camino), 'costo': costo, 'duracion': duracion}
+                continue
+
+            for siguiente, costo_tramo, duracion_tramo in self._conexiones(actual):
+                if siguiente in camino or siguiente not in cotas_costo:
+                    continue
+                nuevo_costo = costo + costo_tramo
+                estimado = nuevo_costo + cotas_costo[siguiente]
+                if nuevo_costo > max_precio or estimado > max_precio + EPSILON:
+                    continue
+                if len(camino) + cotas_tramos[siguiente] > max_tramos:
+                    continue
+                heapq.heappush(cola, (estimado, next(desempate), nuevo_costo,
+                                      duracion + duracion_tramo, camino + (siguiente,)))
+
+    def rutas_pareto(self, origen: str, destino: str, max_precio: float = float('inf'),
+                     max_escalas: int = float('inf')) -> List[Dict]:
+        # Búsqueda multicriterio por etiquetas: cada etiqueta es
+        # (costo, duracion, tramos, ciudad, etiqueta_padre) y se descarta en
+        # cuanto otra etiqueta de la misma ciudad la domina
+        cotas = self._cotas_si_posible(origen, destino, max_precio, max_escalas)
+        if cotas is None:
+            return []
+        cotas_costo, cotas_tramos = cotas
+
+        max_tramos = max_escalas + 1
+        desempate = itertools.count()
+        definitivas = {}
+        frontera = []
+        cola = [(0.0, 0.0, 0, next(desempate), (0.0, 0.0, 0, origen, None))]
+
+        while cola:
+            costo, duracion, tramos, _, etiqueta = heapq.heappop(cola)
+            ciudad = etiqueta[3]
+
+            if domina_alguna(definitivas.get(ciudad, []), costo, duracion, tramos):
+                continue
+            if domina_alguna(frontera, costo + cotas_costo[ciudad], duracion,
+                             tramos + cotas_tramos[ciudad]):
+                continue
+            definitivas.setdefault(ciudad, []).append(etiqueta)
+
+            if ciudad == destino:
+                frontera.append(etiqueta)
+                continue
+
+            for siguiente, costo_tramo, duracion_tramo in self._conexiones(ciudad):
+                if siguiente not in cotas_costo:
+                    continue
+                nuevo_costo = costo + costo_tramo
+                nueva_duracion = duracion + duracion_tramo
+                if nuevo_costo > max_precio or nuevo_costo + cotas_costo[siguiente] > max_precio + EPSILON:
+                    continue
+                if tramos + 1 + cotas_tramos[siguiente] > max_tramos:
+                    continue
+                if domina_alguna(definitivas.get(siguiente, []), nuevo_costo, nueva_duracion, tramos + 1):
+                    continue
+                heapq.heappush(cola, (nuevo_costo, nueva_duracion, tramos + 1, next(desempate),
+                                      (nuevo_costo, nueva_duracion, tramos + 1, siguiente, etiqueta)))
+
+        rutas = []
+        for etiqueta in frontera:
+            costo, duracion = etiqueta[0], etiqueta[1]
+            camino = []
+            while etiqueta is not None:
+                camino.append(etiqueta[3])
+                etiqueta = etiqueta[4]
+            rutas.append({'camino': camino[::-1], 'costo': costo, 'duracion': duracion})
+        return rutas
+
+    def buscar_rutas(self, origen: str, destino: str, max_precio: float = float('inf'),
+                     max_escalas: int = float('inf'), k: int = MAX_RUTAS_MOSTRADAS) -> List[Dict]:
+        rutas = self.cache.obtener('rutas', origen, destino, max_precio, max_escalas, k)
+        if rutas is None:
+            rutas = list(itertools.islice(
+                self.rutas_mas_baratas(origen, destino, max_precio, max_escalas), k))
+            self.cache.guardar('rutas', origen, destino, max_precio, max_escalas, rutas, k)
+        return rutas
+
+    def buscar_frontera(self, origen: str, destino: str, max_precio: float = float('inf'),
+                        max_escalas: int = float('inf')) -> List[Dict]:
+        frontera = self.cache.obtener('pareto', origen, destino, max_precio, max_escalas)
+        if frontera is None:
+            frontera = self.rutas_pareto(origen, destino, max_precio, max_escalas)
+            self.cache.guardar('pareto', origen, destino, max_precio, max_escalas, frontera)
+        return frontera
+
+    def mostrar_rutas(self, rutas: List[Dict], titulo: str = "RUTAS ENCONTRADAS"):
         if not rutas:
             print("\nNo se encontraron rutas que cumplan con los criterios especificados.")
             return
 
         print("\n" + "="*80)
-        print(f"{'RUTAS ENCONTRADAS':^80}")
+        print(f"{titulo:^80}")
         print("="*80)
 
         for i, ruta in enumerate(rutas, 1):
@@ -147,7 +432,12 @@ class BuscadorRutas:
         for entrada in self.historial_busquedas:
             print(f"\nFecha: {entrada['fecha']}")
             print(f"Ruta: {entrada['origen']} → {entrada['destino']}")
-            print(f"Rutas encontradas: {entrada['rutas_encontradas']}")
+            # Las entradas anteriores a la búsqueda de las rutas más baratas
+            # guardan el total de rutas; las nuevas, las que se mostraron
+            if 'rutas_encontradas' in entrada:
+                print(f"Rutas encontradas: {entrada['rutas_encontradas']}")
+            else:
+                print(f"Rutas mostradas: {entrada['rutas_mostradas']}")
             
             if entrada['mejor_precio']:
                 print(f"Mejor precio: ${entrada['mejor_precio']:.2f} USD")
@@ -162,10 +452,6 @@ class BuscadorRutas:
             
             print("-" * 40)
 
-    def actualizar_estadisticas(self, origen: str, destino: str):
-        ruta_key = f"{origen}-{destino}"
-        self.estadisticas['rutas_populares'][ruta_key] += 1
-
     def mostrar_estadisticas(self):
         print("\n" + "="*80)
         print(f"{'ESTADÍSTICAS DE BÚSQUEDAS':^80}")
@@ -176,37 +462,96 @@ class BuscadorRutas:
             return
 
         print("\nRutas más buscadas:")
-        for ruta, cantidad in self.estadisticas['rutas_populares'].most_common(5):
+        rutas_populares = self.estadisticas['rutas_populares']
+        for ruta, cantidad in self.estadisticas['top_rutas'].mas_buscadas(rutas_populares):
             origen, destino = ruta.split('-')
             print(f"{origen} → {destino}: {cantidad} búsqueda{'s' if cantidad > 1 else ''}")
 
-        if self.historial_busquedas:
-            total_busquedas = len(self.historial_busquedas)
-            suma_costos = sum(b['mejor_precio'] for b in self.historial_busquedas if b['mejor_precio'])
-            promedio_costo = suma_costos / total_busquedas if total_busquedas > 0 else 0
+        if self.estadisticas['total_busquedas']:
+            precio = self.estadisticas['precio']
+            duracion = self.estadisticas['duracion']
             
-            print(f"\nTotal de búsquedas realizadas: {total_busquedas}")
-            print(f"Costo promedio de rutas: ${promedio_costo:.2f} USD")
+            print(f"\nTotal de búsquedas realizadas: {self.estadisticas['total_busquedas']}")
+            if precio.cantidad:
+                print(f"Costo promedio de rutas: ${precio.promedio():.2f} USD")
+                print(f"Mejor precio mínimo / máximo: ${precio.minimo:.2f} / ${precio.maximo:.2f} USD")
+                print(f"Mediana / percentil 90 del mejor precio: "
+                      f"${precio.percentil(50):.2f} / ${precio.percentil(90):.2f} USD")
+            if duracion.cantidad:
+                print(f"Duración promedio: {formatear_duracion(duracion.promedio())}")
+                print(f"Mediana / percentil 90 de la mejor duración: "
+                      f"{formatear_duracion(duracion.percentil(50))} / "
+                      f"{formatear_duracion(duracion.percentil(90))}")
+
+        cache = self.cache.estadisticas()
+        print(f"\nCache de consultas: {cache['aciertos']} aciertos, {cache['fallos']} fallos "
+              f"({cache['tasa_aciertos']:.0%}), {cache['entradas']} entradas")
+
+def crear_entrada_busqueda(origen, destino, rutas, frontera=None):
+    # Cada criterio se toma de la mejor ruta para ese criterio; la frontera
+    # de Pareto contiene el óptimo de los tres
+    opciones = frontera if frontera else rutas
+    return {
+        'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'origen': origen,
+        'destino': destino,
+        'rutas_mostradas': len(rutas),
+        'mejor_precio': min(r['costo'] for r in opciones) if opciones else None,
+        'mejor_duracion': min(r['duracion'] for r in opciones) if opciones else None,
+        'menos_escalas': min(len(r['camino']) - 2 for r in opciones) if opciones else None
+    }
+
+def estadisticas_vacias():
+    return {
+        'rutas_populares': Counter(),
+        'top_rutas': TopRutas(),
+        'total_busquedas': 0,
+        'precio': ResumenMetrica(),
+        'duracion': ResumenMetrica()
+    }
+
+def formatear_duracion(duracion):
+    horas = int(duracion)
+    minutos = int((duracion - horas) * 60)
+    return f"{horas}h {minutos:02d}min"
+
+def domina_alguna(etiquetas, costo, duracion, tramos):
+    for etiqueta in etiquetas:
+        if etiqueta[0] <= costo and etiqueta[1] <= duracion and etiqueta[2] <= tramos:
+            return True
+    return False
 
 def main():
-    buscador = BuscadorRutas()
+    parser = argparse.ArgumentParser(description="Buscador interactivo de rutas de vuelo.")
+    # El índice ocupa O(V²) y construirlo la primera vez es lento, así que
+    # solo se usa si se pide
+    parser.add_argument('--indexar', action='store_true',
+                        help="cargar (o construir) el índice de cotas entre todo par de ciudades")
+    argumentos = parser.parse_args()
+    buscador = BuscadorRutas(compacto=True, indexar=argumentos.indexar)
+    horario = HorarioVuelos()
     
-    while True:
-        mostrar_menu()
-        
-        opcion = input("\nSeleccione una opción: ").strip()
-        
-        if opcion == "1":
-            opcion_buscar_rutas(buscador)
-        elif opcion == "2":
-            buscador.mostrar_historial()
-        elif opcion == "3":
-            buscador.mostrar_estadisticas()
-        elif opcion == "4":
-            print("\n¡Gracias por usar el buscador de rutas!")
-            break
-        else:
-            print("\nOpción no válida. Por favor, intente de nuevo.")
+    try:
+        while True:
+            mostrar_menu()
+            
+            opcion = input("\nSeleccione una opción: ").strip()
+            
+            if opcion == "1":
+                opcion_buscar_rutas(buscador)
+            elif opcion == "2":
+                buscador.mostrar_historial()
+            elif opcion == "3":
+                buscador.mostrar_estadisticas()
+            elif opcion == "4":
+                opcion_buscar_horario(horario)
+            elif opcion == "5":
+                print("\n¡Gracias por usar el buscador de rutas!")
+                break
+            else:
+                print("\nOpción no válida. Por favor, intente de nuevo.")
+    finally:
+        buscador.guardar_historial()
 
 def mostrar_menu():
     print("\n" + "="*40)
@@ -215,7 +560,8 @@ def mostrar_menu():
     print("1. Buscar rutas")
     print("2. Ver historial de búsquedas")
     print("3. Ver estadísticas")
-    print("4. Salir")
+    print("4. Buscar vuelos por horario")
+    print("5. Salir")
 
 def opcion_buscar_rutas(buscador):
     ciudad_origen = input("Ciudad de origen: ").strip().title()
@@ -237,20 +583,60 @@ def opcion_buscar_rutas(buscador):
         max_precio = float('inf')
         max_escalas = 999
 
-    rutas = buscador.encontrar_todas_las_rutas(
+    rutas = buscador.buscar_rutas(
         ciudad_origen, ciudad_destino,
         max_precio=max_precio,
         max_escalas=max_escalas
     )
 
     if rutas:
-        rutas_ordenadas = sorted(rutas, key=lambda x: x['costo'])
-        buscador.mostrar_rutas(rutas_ordenadas[:10])
-        buscador.actualizar_estadisticas(ciudad_origen, ciudad_destino)
-        buscador.guardar_busqueda(ciudad_origen, ciudad_destino, rutas_ordenadas)
+        frontera = buscador.buscar_frontera(
+            ciudad_origen, ciudad_destino,
+            max_precio=max_precio,
+            max_escalas=max_escalas
+        )
+        buscador.mostrar_rutas(rutas)
+        buscador.mostrar_rutas(frontera, titulo="OPCIONES ÓPTIMAS (PRECIO, DURACIÓN, ESCALAS)")
+        buscador.guardar_busqueda(ciudad_origen, ciudad_destino, rutas, frontera)
     else:
         print(f"\nNo se encontraron rutas entre {ciudad_origen} y {ciudad_destino}")
         print("que cumplan con los criterios especificados.")
 
+def opcion_buscar_horario(horario):
+    ciudad_origen = horario.buscar_ciudad(input("Ciudad de origen: "))
+    ciudad_destino = horario.buscar_ciudad(input("Ciudad destino: "))
+
+    if ciudad_origen is None or ciudad_destino is None:
+        print("\nError: la ciudad no está en el horario de vuelos")
+        print("Ciudades disponibles:", ", ".join(horario.ciudades))
+        return
+
+    try:
+        hora_input = input("Hora de salida (HH:MM, Enter para 00:00): ").strip()
+        hora_salida = leer_hora(hora_input) if hora_input else 0
+    except ValueError:
+        print("Hora inválida. Usando 00:00.")
+        hora_salida = 0
+
+    itinerario = horario.llegada_mas_temprana(ciudad_origen, ciudad_destino, hora_salida)
+    if itinerario is None:
+        print(f"\nNo hay vuelos entre {ciudad_origen} y {ciudad_destino}")
+        print("en el horario a partir de esa hora.")
+        return
+    mostrar_itinerario(itinerario)
+
+def mostrar_itinerario(itinerario):
+    print("\n" + "="*60)
+    print(f"{'LLEGADA MÁS TEMPRANA':^60}")
+    print("="*60)
+    for tramo in itinerario['tramos']:
+        print(f"{tramo['vuelo']}  {tramo['origen']} {formatear_hora(tramo['salida'])} → "
+              f"{tramo['destino']} {formatear_hora(tramo['llegada'])}  ${tramo['costo']:.2f}")
+    print("-"*60)
+    print(f"Llegada: {formatear_hora(itinerario['llegada'])}")
+    print(f"Duración total: {formatear_duracion(itinerario['duracion'])} "
+          f"(espera en conexiones: {formatear_duracion(itinerario['espera'])})")
+    print(f"Costo total: ${itinerario['costo']:.2f}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import lote
+from main import BuscadorRutas, MAX_RUTAS_MOSTRADAS, RUTA_HISTORIAL, crear_entrada_busqueda
+
+MAX_CONSULTAS_EN_CURSO = 256
+MAX_PENDIENTES_POR_CONEXION = 32
+MAX_ENTRADAS_HISTORIAL = 10000
+
+
+class ServidorRutas:
+    # Servidor asyncio de JSON por líneas: cada línea recibida es una consulta
+    # {"id", "origen", "destino", "max_precio", "max_escalas"} y cada línea
+    # enviada es su respuesta con el mismo "id". Las búsquedas corren en un
+    # pool de procesos y el historial se escribe en un hilo aparte.
+
+    def __init__(self, buscador, procesos=None, host='127.0.0.1', puerto=0,
+                 max_en_curso=MAX_CONSULTAS_EN_CURSO):
+        self.buscador = buscador
+        self.procesos = procesos or os.cpu_count() or 1
+        self.host = host
+        self.puerto = puerto
+        self.limite_en_curso = asyncio.Semaphore(max_en_curso)
+        self.en_curso = {}
+        self.cola_historial = asyncio.Queue(MAX_ENTRADAS_HISTORIAL)
+        self.servidor = None
+        self.ejecutor = None
+        self.escritor_historial = None
+        self.consultas_atendidas = 0
+        self.consultas_agrupadas = 0
+
+    async def iniciar(self):
+        # Los procesos heredan el buscador con 'fork' igual que en lote.py
+        metodos = multiprocessing.get_all_start_methods()
+        contexto = multiprocessing.get_context('fork' if 'fork' in metodos else None)
+        if contexto.get_start_method() == 'fork':
+            lote.compartir_buscador(self.buscador)
+        self.ejecutor = ProcessPoolExecutor(
+            self.procesos, mp_context=contexto, initializer=lote.iniciar_trabajador,
+            initargs=(self.buscador.archivo_rutas, self.buscador.compacto, self.buscador.indexar))
+        # Los procesos se crean ahora, antes de que existan hilos en este proceso
+        await asyncio.get_running_loop().run_in_executor(self.ejecutor, os.getpid)
+        self.escritor_historial = asyncio.create_task(self._escribir_historial())
+        self.servidor = await asyncio.start_server(self._atender_conexion, self.host, self.puerto)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+
+    async def cerrar(self):
+        self.servidor.close()
+        await self.servidor.wait_closed()
+        await self.cola_historial.join()
+        self.escritor_historial.cancel()
+        self.ejecutor.shutdown()
+        await asyncio.to_thread(self.buscador.guardar_historial)
+
+    async def _atender_conexion(self, lector, escritor):
+        # Cada conexión puede enviar varias consultas sin esperar respuesta,
+        # pero no se lee la siguiente línea mientras haya demasiadas
+        # pendientes: así la presión se transmite al cliente por TCP
+        pendientes_conexion = asyncio.Semaphore(MAX_PENDIENTES_POR_CONEXION)
+        tareas = set()
+        try:
+            while True:
+                await pendientes_conexion.acquire()
+                linea = await lector.readline()
+                if not linea:
+                    pendientes_conexion.release()
+                    break
+                tarea = asyncio.create_task(self._responder(linea, escritor))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+                tarea.add_done_callback(lambda _: pendientes_conexion.release())
+            if tareas:
+                await asyncio.gather(*tareas)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, linea, escritor):
+        pedido = {}
+        try:
+            pedido = json.loads(linea)
+            respuesta = await self.resolver(pedido)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            respuesta = {'error': f"Consulta inválida: {error!r}"}
+        except Exception as error:
+            respuesta = {'error': f"Error al resolver la consulta: {error!r}"}
+        respuesta['id'] = pedido.get('id') if isinstance(pedido, dict) else None
+        escritor.write((json.dumps(respuesta, ensure_ascii=False) + '\n').encode('utf-8'))
+        await escritor.drain()
+
+    async def resolver(self, pedido):
+        consulta = (pedido['origen'], pedido['destino'],
+                    float('inf') if pedido.get('max_precio') is None else float(pedido['max_precio']),
+                    float('inf') if pedido.get('max_escalas') is None else int(pedido['max_escalas']))
+
+        # La cache del proceso principal responde sin pasar por el pool
+        rutas = self.buscador.cache.obtener('rutas', *consulta, k=MAX_RUTAS_MOSTRADAS)
+        frontera = self.buscador.cache.obtener('pareto', *consulta) if rutas is not None else None
+        if rutas is not None and frontera is not None:
+            resultado = {'rutas': rutas, 'frontera': frontera}
+            entrada = crear_entrada_busqueda(consulta[0], consulta[1], rutas, frontera) if rutas else None
+        else:
+            resultado, entrada = await self._resolver_en_pool(consulta)
+
+        self.consultas_atendidas += 1
+        if entrada is not None:
+            await self.cola_historial.put(entrada)
+        return {'rutas': resultado['rutas'], 'frontera': resultado['frontera']}
+
+    async def _resolver_en_pool(self, consulta):
+        # Consultas idénticas que llegan mientras otra está en curso esperan el
+        # mismo resultado en lugar de repetir la búsqueda
+        futuro = self.en_curso.get(consulta)
+        if futuro is not None:
+            self.consultas_agrupadas += 1
+            return await asyncio.shield(futuro)
+
+        futuro = asyncio.get_running_loop().create_future()
+        self.en_curso[consulta] = futuro
+        try:
+            async with self.limite_en_curso:
+                resultados = await asyncio.get_running_loop().run_in_executor(
+                    self.ejecutor, lote.resolver_consultas, [consulta])
+            resultado = resultados[0]
+            entrada = resultado.pop('entrada')
+            self.buscador.cache.guardar('rutas', *consulta, resultado['rutas'], k=MAX_RUTAS_MOSTRADAS)
+            self.buscador.cache.guardar('pareto', *consulta, resultado['frontera'])
+            futuro.set_result((resultado, entrada))
+        except Exception as error:
+            futuro.set_exception(error)
+        finally:
+            del self.en_curso[consulta]
+        return await futuro
+
+    async def _escribir_historial(self):
+        # Toma todas las entradas disponibles y las registra en un hilo, así
+        # la escritura en disco nunca bloquea el ciclo de eventos
+        while True:
+            entradas = [await self.cola_historial.get()]
+            while not self.cola_historial.empty():
+                entradas.append(self.cola_historial.get_nowait())
+            try:
+                await asyncio.to_thread(self.buscador.registrar_entradas, entradas)
+            finally:
+                for _ in entradas:
+                    self.cola_historial.task_done()
+
+
+async def consultar(host, puerto, consultas):
+    # Cliente mínimo: envía todas las consultas por una conexión y retorna las
+    # respuestas indexadas por "id"
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    for i, consulta in enumerate(consultas):
+        escritor.write((json.dumps({'id': i, **consulta}, ensure_ascii=False) + '\n').encode('utf-8'))
+    await escritor.drain()
+    respuestas = {}
+    while len(respuestas) < len(consultas):
+        respuesta = json.loads(await lector.readline())
+        respuestas[respuesta['id']] = respuesta
+    escritor.close()
+    await escritor.wait_closed()
+    return [respuestas[i] for i in range(len(consultas))]
+
+
+async def servir(archivo_rutas, host, puerto, procesos, historial):
+    buscador = BuscadorRutas(archivo_rutas, historial, compacto=True, indexar=True)
+    servidor = ServidorRutas(buscador, procesos, host, puerto)
+    await servidor.iniciar()
+    print(f"Servidor de rutas escuchando en {servidor.host}:{servidor.puerto}")
+    try:
+        await servidor.servidor.serve_forever()
+    finally:
+        await servidor.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de consultas de rutas (JSON por líneas).")
+    parser.add_argument('--rutas', default="PROYECTOFINAL/rutas_vuelos.csv")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('-p', '--procesos', type=int, default=None)
+    parser.add_argument('--historial', default=RUTA_HISTORIAL)
+    argumentos = parser.parse_args()
+    try:
+        asyncio.run(servir(argumentos.rutas, argumentos.host, argumentos.puerto, argumentos.procesos, argumentos.historial))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
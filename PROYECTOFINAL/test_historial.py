@@ -0,0 +1,95 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from historial import RESUMEN_CADA
+from main import BuscadorRutas, crear_entrada_busqueda
+
+RUTAS = Path(__file__).parent / "rutas_vuelos.csv"
+CIUDADES = ["Bogota", "Medellin", "Miami", "Lima", "Madrid"]
+
+
+def entradas(cantidad):
+    # Entradas como las que arman la CLI y el servidor, sin buscar rutas
+    for i in range(cantidad):
+        origen = CIUDADES[i % len(CIUDADES)]
+        destino = CIUDADES[(i + 1 + i // len(CIUDADES)) % len(CIUDADES)]
+        if origen == destino:
+            destino = CIUDADES[(i + 2) % len(CIUDADES)]
+        ruta = {'costo': 100.0 + i % 37, 'duracion': 1.5 + i % 11, 'camino': [origen, destino]}
+        yield crear_entrada_busqueda(origen, destino, [ruta])
+
+
+def tipos_registros(archivo):
+    with open(archivo, 'r', encoding='utf-8') as lineas:
+        return Counter(json.loads(linea)['tipo'] for linea in lineas)
+
+
+def test_muchas_busquedas_agregan_resumen(tmp_path):
+    archivo = tmp_path / "historial.jsonl"
+    buscador = BuscadorRutas(RUTAS, archivo)
+    cantidad = 5 * RESUMEN_CADA
+    for entrada in entradas(cantidad):
+        buscador.registrar_entrada(entrada)
+    buscador.guardar_historial()
+
+    tipos = tipos_registros(archivo)
+    assert tipos['busqueda'] == cantidad
+    assert tipos['resumen'] >= 1
+    assert tipos['ruta_popular'] == 0
+
+    cargado = BuscadorRutas(RUTAS, archivo)
+    assert len(cargado.historial_busquedas) == cantidad
+    assert cargado.estadisticas['rutas_populares'] == buscador.estadisticas['rutas_populares']
+    assert cargado.estadisticas['total_busquedas'] == cantidad
+
+
+def test_compacta_ruta_popular_anteriores(tmp_path):
+    # Un historial con un 'ruta_popular' por búsqueda, como los de antes
+    archivo = tmp_path / "historial.jsonl"
+    with open(archivo, 'w', encoding='utf-8') as salida:
+        for entrada in entradas(RESUMEN_CADA):
+            salida.write(json.dumps({'tipo': 'busqueda', **entrada}) + '\n')
+            salida.write(json.dumps({'tipo': 'ruta_popular',
+                                     'ruta': f"{entrada['origen']}-{entrada['destino']}"}) + '\n')
+
+    buscador = BuscadorRutas(RUTAS, archivo)
+    esperadas = Counter(f"{entrada['origen']}-{entrada['destino']}" for entrada in entradas(RESUMEN_CADA))
+    assert buscador.estadisticas['rutas_populares'] == esperadas
+
+    buscador.registrar_entrada(next(entradas(1)))
+    buscador.guardar_historial()
+    tipos = tipos_registros(archivo)
+    assert tipos['ruta_popular'] == 0
+    assert tipos['resumen'] == 1
+    assert tipos['busqueda'] == RESUMEN_CADA + 1
+
+
+def test_agregados_se_cargan_del_resumen(tmp_path, monkeypatch):
+    archivo = tmp_path / "historial.jsonl"
+    buscador = BuscadorRutas(RUTAS, archivo)
+    cantidad = RESUMEN_CADA + 7
+    for entrada in entradas(cantidad):
+        buscador.registrar_entrada(entrada)
+    buscador.guardar_historial()
+
+    with open(archivo, 'r', encoding='utf-8') as lineas:
+        resumenes = [registro for registro in map(json.loads, lineas) if registro['tipo'] == 'resumen']
+    assert len(resumenes) == 1 and 'agregados' in resumenes[0]
+
+    # Solo las búsquedas posteriores al resumen se vuelven a acumular
+    acumuladas = []
+    acumular = BuscadorRutas._acumular_busqueda
+    monkeypatch.setattr(BuscadorRutas, '_acumular_busqueda',
+                        lambda self, entrada: (acumuladas.append(entrada), acumular(self, entrada)))
+    cargado = BuscadorRutas(RUTAS, archivo)
+    assert len(acumuladas) == 7
+
+    for clave in ('precio', 'duracion'):
+        assert cargado.estadisticas[clave].a_dict() == buscador.estadisticas[clave].a_dict()
+    assert cargado.estadisticas['total_busquedas'] == cantidad
+    assert cargado.estadisticas['rutas_populares'] == buscador.estadisticas['rutas_populares']
+    # Con empates el orden del top puede variar; las cantidades no
+    top = [cantidad for _, cantidad in cargado.estadisticas['top_rutas'].mas_buscadas(
+        cargado.estadisticas['rutas_populares'])]
+    assert top == [cantidad for _, cantidad in buscador.estadisticas['rutas_populares'].most_common(len(top))]